@@ -1,8 +1,16 @@
 # Speech-to-text and text-to-speech helpers
-import pyttsx3
-import speech_recognition as sr
+# pyttsx3 and speech_recognition are imported lazily so that launching the
+# agent does not pay for loading the audio stack before Rick's first word.
+import threading
 import time
 
+# Shared recognizer, calibrated once by prepare_microphone()
+_recognizer = None
+_recognizer_lock = threading.Lock()
+
+# Continuous capture for barge-in, started by enable_full_duplex()
+_duplex = None
+
 # Initialize text-to-speech engine
 # try:
 #     engine = pyttsx3.init()
@@ -36,13 +44,25 @@ import time
 #     print(f"Failed to initialize text-to-speech engine: {e}")
 #     engine = None
 def get_enginge():
+    import pyttsx3
     engine = pyttsx3.init()
     rate = engine.getProperty('rate')
     engine.setProperty('rate', rate + 100)
     return engine
 
-def speak(text):
-    """Convert text to speech with Rick's voice - with error logging."""
+def speak(text, interruptible=False):
+    """
+    Convert text to speech with Rick's voice - with error logging.
+
+    Args:
+        text (str): What Rick says
+        interruptible (bool): In full-duplex mode, stop speaking as soon as the candidate talks
+
+    Returns:
+        bool: True if the candidate interrupted (full-duplex mode only)
+    """
+    if _duplex is not None:
+        return _duplex.speak(text, interruptible=interruptible)
     engine = get_enginge()
     if engine:
         try:
@@ -57,27 +77,105 @@ def speak(text):
         # If no engine, print a message and wait to simulate speech
         print("Text-to-speech engine not initialized. Simulating speech.")
         time.sleep(len(text) * 0.1)
+    return False
 
-def listen(timeout=15, phrase_time_limit=20):
+def prepare_microphone(duration=1.0):
+    """
+    Open the microphone once and calibrate a shared recognizer for ambient noise.
+
+    Meant to run in the background while Rick is greeting the candidate, so
+    that the first listen() does not have to probe the device itself.
+
+    Args:
+        duration (float): Seconds of ambient noise to sample
+
+    Returns:
+        bool: True if the microphone was calibrated successfully
+    """
+    global _recognizer
+    import speech_recognition as sr
+
+    with _recognizer_lock:
+        if _recognizer is not None:
+            return True
+        recognizer = sr.Recognizer()
+        try:
+            with sr.Microphone() as source:
+                recognizer.adjust_for_ambient_noise(source, duration=duration)
+        except Exception as e:
+            print(f"Microphone calibration failed: {e}")
+            return False
+        _recognizer = recognizer
+        return True
+
+def enable_full_duplex():
+    """
+    Keep the microphone open while Rick speaks so candidates can interrupt him.
+
+    Needs a calibrated recognizer, so call it after prepare_microphone(). Until it has
+    been called, speak() and listen() behave as usual.
+
+    Returns:
+        bool: True if continuous capture started
+    """
+    global _duplex
+    with _recognizer_lock:
+        recognizer = _recognizer
+    if recognizer is None:
+        return False
+    if _duplex is None:
+        try:
+            from duplex_audio import FullDuplexAudio
+            duplex = FullDuplexAudio(recognizer)
+            duplex.start()
+        except Exception as e:
+            print(f"Full-duplex audio unavailable, falling back to turn-taking: {e}")
+            return False
+        _duplex = duplex
+    return True
+
+def listen(timeout=15, phrase_time_limit=20, record_to=None):
     """
     Listen for voice input and convert to text - completely voice-based interview.
     
     Args:
         timeout (int): Timeout in seconds for listening (increased for interview setting)
         phrase_time_limit (int): Maximum time for a single phrase (increased for detailed answers)
+        record_to (str, optional): Path without extension to stream the captured audio to
     
     Returns:
         str: Recognized text or error message
     """
-    recognizer = sr.Recognizer()
+    if _duplex is not None:
+        return _duplex.listen(timeout=timeout, phrase_time_limit=phrase_time_limit, record_to=record_to)
+
+    import speech_recognition as sr
+
+    # Wait for a background calibration that is still in progress, then reuse it
+    with _recognizer_lock:
+        recognizer = _recognizer
+    calibrated = recognizer is not None
+    if not calibrated:
+        recognizer = sr.Recognizer()
     
     # Adjust for ambient noise
     try:
         with sr.Microphone() as source:
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            if not calibrated:
+                recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            
+            recorder = None
+            if record_to:
+                from recordings import AnswerRecorder, TeeStream
+                recorder = AnswerRecorder(record_to, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                source.stream = TeeStream(source.stream, recorder)
             
             try:
-                audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+                try:
+                    audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+                finally:
+                    if recorder:
+                        recorder.close()
                 
                 # Try Google Speech Recognition first
                 try:
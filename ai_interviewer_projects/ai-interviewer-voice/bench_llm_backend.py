@@ -0,0 +1,55 @@
+# Benchmark the LLM backend pool against local stub servers
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_backend import LLMBackendPool
+from ollama_stub import StubConfig, start_stub_server
+
+def run_request(pool: LLMBackendPool):
+    started = time.perf_counter()
+    try:
+        pool.chat(messages=[{'role': 'user', 'content': 'Question: Why this role?\nAnswer: I like it.'}])
+        return time.perf_counter() - started, True
+    except Exception:
+        return time.perf_counter() - started, False
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test LLMBackendPool against simulated Ollama hosts.")
+    parser.add_argument("--hosts", type=int, default=3, help="Number of stub hosts to start")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean latency of a healthy host")
+    parser.add_argument("--slow-host-latency", type=float, default=1.0, help="Mean latency of the last host")
+    parser.add_argument("--failing-host-rate", type=float, default=0.5, help="Failure rate of the first host")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    # One flaky host, one slow host, the rest healthy
+    configs = [StubConfig(latency=args.latency, jitter=args.latency / 4) for _ in range(args.hosts)]
+    configs[0].failure_rate = args.failing_host_rate
+    if args.hosts > 1:
+        configs[-1].latency = args.slow_host_latency
+    servers = [start_stub_server(config=config) for config in configs]
+    pool = LLMBackendPool([f"http://127.0.0.1:{s.server_port}" for s in servers], timeout=args.timeout)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(lambda _: run_request(pool), range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    failures = sum(1 for r in results if not r[1])
+    print(f"{args.requests} requests in {elapsed:.2f}s ({args.requests / elapsed:.1f} req/s), {failures} failed")
+    print(f"latency p50 {statistics.median(latencies):.0f} ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.0f} ms  max {latencies[-1]:.0f} ms")
+    for stats, config in zip(pool.stats(), configs):
+        print(f"  {stats['host']}: {stats['completed']} ok, {stats['failed']} failed, "
+              f"breaker {stats['breaker']} (latency {config.latency}s, failure rate {config.failure_rate})")
+
+    for server in servers:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Startup benchmark: time from launch to Rick's first word
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+# Runs in a fresh interpreter so every measurement includes module imports.
+# speak() is replaced by a probe that records the moment Rick would start talking, and
+# the background warm-up is skipped so the probe exits at once and leaves no files behind.
+PROBE = """
+import time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter()
+
+if hasattr(main.AIInterviewAgent, 'start_background_init'):
+    main.AIInterviewAgent.start_background_init = lambda self: None
+
+def first_word(text):
+    t_speak = time.perf_counter()
+    t_engine = t_speak
+    if {with_tts}:
+        import audio_utils
+        audio_utils.get_enginge()
+        t_engine = time.perf_counter()
+    print(f"\\nSTARTUP {{t_import - t0:.6f}} {{t_speak - t0:.6f}} {{t_engine - t0:.6f}}")
+    raise SystemExit(0)
+
+main.speak = first_word
+main.main()
+"""
+
+def run_once(with_tts=False, directory=None):
+    """
+    Launch the agent in a subprocess and measure how long it takes to reach the first word.
+
+    Args:
+        with_tts (bool): Also include text-to-speech engine initialization
+        directory (str, optional): Source tree to launch; defaults to this one
+
+    Returns:
+        tuple: (import seconds, first speak() seconds, first word seconds)
+    """
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(with_tts=with_tts)],
+        cwd=directory, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "startup probe failed")
+    # Background warm-up may print to stdout too, so pick out the probe's line
+    line = next(l for l in result.stdout.splitlines() if l.startswith("STARTUP "))
+    return tuple(float(v) for v in line.split()[1:4])
+
+def export_revision(revision, destination):
+    """Write this directory as of a git revision, e.g. the commit before a change, to `destination`."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    top, prefix = subprocess.run(["git", "rev-parse", "--show-toplevel", "--show-prefix"], cwd=here,
+                                 capture_output=True, text=True, check=True).stdout.splitlines()
+    archive = subprocess.run(["git", "archive", "--format=tar", f"{revision}:{prefix}"],
+                             cwd=top, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(destination)
+
+def measure(runs, with_tts=False, directory=None):
+    """Median first-word timings in milliseconds over several cold launches, printed as a table."""
+    samples = [run_once(with_tts, directory) for _ in range(runs)]
+    medians = []
+    for label, index in (("imports", 0), ("first speak()", 1), ("first word", 2)):
+        values = [s[index] * 1000 for s in samples]
+        medians.append(statistics.median(values))
+        print(f"{label:>14}: median {medians[-1]:8.1f} ms  "
+              f"min {min(values):8.1f} ms  max {max(values):8.1f} ms")
+    return medians
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time from launch to Rick's first word.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold launches to measure")
+    parser.add_argument("--with-tts", action="store_true", help="Include pyttsx3 engine initialization")
+    parser.add_argument("--baseline", metavar="REVISION",
+                        help="Also measure this git revision, e.g. a commit before a startup change, for comparison")
+    args = parser.parse_args()
+
+    print("current tree")
+    current = measure(args.runs, args.with_tts)
+    if not args.baseline:
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        export_revision(args.baseline, directory)
+        print(f"\n{args.baseline}")
+        baseline = measure(args.runs, args.with_tts, directory)
+    print(f"\nfirst word: {baseline[2]:.1f} ms -> {current[2]:.1f} ms ({baseline[2] - current[2]:.1f} ms faster)")
+
+if __name__ == "__main__":
+    main()
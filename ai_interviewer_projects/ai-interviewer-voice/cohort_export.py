@@ -0,0 +1,131 @@
+# Export archived interview sessions to a single XLSX workbook
+import argparse
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from session_store import iter_sessions
+
+ANSWER_COLUMNS = ['Session ID', 'Candidate', 'Date', 'Role', 'Question #', 'Follow-up',
+                  'Question', 'Answer', 'Feedback', 'Score']
+CANDIDATE_COLUMNS = ['Session ID', 'Candidate', 'Date', 'Role', 'Questions Answered', 'Average Score',
+                     'Overall Feedback', 'Resume Suggested Role', 'Years of Experience', 'Resume Skills']
+
+# Excel caps a cell at 32,767 characters
+MAX_CELL_CHARS = 32767
+
+def _cell(value: Any) -> Any:
+    """Make a value safe to write into a worksheet cell."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    return ILLEGAL_CHARACTERS_RE.sub('', str(value))[:MAX_CELL_CHARS]
+
+def _resume_skills(resume_data: Dict[str, Any]) -> str:
+    """All skills found by ResumeParser.parse_resume, across roles and without duplicates."""
+    skills = []
+    for role_skills in (resume_data.get('skills') or {}).values():
+        skills.extend(s for s in role_skills if s not in skills)
+    return ', '.join(skills)
+
+def session_rows(session_id: str, session: Dict[str, Any]) -> Tuple[List[list], list]:
+    """
+    Turn one archived session into spreadsheet rows.
+
+    Args:
+        session_id (str): ID of the session
+        session (dict): The archived session
+
+    Returns:
+        tuple: (one row per answer, one summary row for the candidate)
+    """
+    candidate = session.get('user_name')
+    date = session.get('date')
+    role = (session.get('role') or '').replace('_', ' ').title()
+    interview_data = session.get('interview_data') or []
+
+    answer_rows = [[
+        session_id, candidate, date, role,
+        item.get('question_number'),
+        'Yes' if item.get('follow_up') else 'No',
+        item.get('question'),
+        item.get('answer'),
+        item.get('feedback'),
+        item.get('score')
+    ] for item in interview_data]
+
+    scores = [item['score'] for item in interview_data if isinstance(item.get('score'), (int, float))]
+    resume_data = session.get('resume_data') or {}
+    parsed = resume_data.get('parsed_successfully')
+    final_evaluation = session.get('final_evaluation') or {}
+    candidate_row = [
+        session_id, candidate, date, role,
+        len(interview_data),
+        round(sum(scores) / len(scores), 1) if scores else None,
+        final_evaluation.get('overall_feedback'),
+        (resume_data.get('suggested_role') or '').replace('_', ' ').title() if parsed else None,
+        (resume_data.get('experience') or {}).get('years_experience') if parsed else None,
+        _resume_skills(resume_data) if parsed else None
+    ]
+    return answer_rows, candidate_row
+
+def export_cohort(filename: str, sessions: Iterable[Tuple[str, Dict[str, Any]]] = None,
+                  role: str = None, progress_every: int = 10000) -> Dict[str, Any]:
+    """
+    Stream sessions into an XLSX workbook with an Answers sheet and a Candidates sheet.
+
+    The workbook is written in openpyxl's write-only mode and sessions are read one at a
+    time, so memory stays flat however many candidates are exported.
+
+    Args:
+        filename (str): Output .xlsx path
+        sessions (iterable, optional): (session_id, session) pairs; defaults to every archived session
+        role (str, optional): Only export candidates interviewed for this role
+        progress_every (int): Print throughput every this many answer rows
+
+    Returns:
+        Dict[str, Any]: Number of candidates and rows written, elapsed seconds and rows per second
+    """
+    from openpyxl import Workbook
+
+    started = time.perf_counter()
+    workbook = Workbook(write_only=True)
+    answers_sheet = workbook.create_sheet('Answers')
+    candidates_sheet = workbook.create_sheet('Candidates')
+    answers_sheet.append(ANSWER_COLUMNS)
+    candidates_sheet.append(CANDIDATE_COLUMNS)
+
+    candidates = 0
+    rows = 0
+    for session_id, session in (iter_sessions() if sessions is None else sessions):
+        if role and session.get('role') != role:
+            continue
+        answer_rows, candidate_row = session_rows(session_id, session)
+        for row in answer_rows:
+            answers_sheet.append([_cell(v) for v in row])
+            rows += 1
+            if progress_every and rows % progress_every == 0:
+                print(f"  {rows} rows ({rows / (time.perf_counter() - started):.0f} rows/s)")
+        candidates_sheet.append([_cell(v) for v in candidate_row])
+        candidates += 1
+
+    workbook.save(filename)
+    elapsed = time.perf_counter() - started
+    return {
+        'candidates': candidates,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed else 0.0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Export archived interview sessions to an XLSX workbook.")
+    parser.add_argument("--output", default="cohort_export.xlsx", help="Path of the workbook to write")
+    parser.add_argument("--role", help="Only export candidates for this role, e.g. backend_engineer")
+    args = parser.parse_args()
+
+    result = export_cohort(args.output, role=args.role)
+    print(f"Exported {result['candidates']} candidates ({result['rows']} answer rows) to {args.output} "
+          f"in {result['seconds']:.1f}s ({result['rows_per_second']:.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+# Near-duplicate detection for resumes and answers with MinHash and LSH
+import argparse
+import os
+import pickle
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from session_store import SESSIONS_DIR, answer_key, iter_sessions
+
+# Where the persistent indexes live, next to the archived sessions
+INDEX_DIR = os.path.join(SESSIONS_DIR, '_index')
+
+# Hashes are taken modulo a Mersenne prime below 2**31 so a * x + b never overflows uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+class MinHashIndex:
+    """
+    Incremental MinHash/LSH index over word shingles.
+
+    Each document is reduced to a `num_perm`-value MinHash signature, split into `bands`
+    bands. Documents sharing any band land in the same bucket, so a query only compares
+    against bucket-mates instead of every stored document. Candidates are then kept if
+    their estimated Jaccard similarity reaches the threshold. With 128 permutations in
+    16 bands, pairs above ~0.7 similarity are almost always found.
+
+    On disk an index is a pickled snapshot plus an append-only log of documents added
+    since. Each add() appends one record, so saving costs the same however big the
+    archive gets, and concurrent interviews never overwrite each other's entries;
+    refresh() picks up records other processes have appended.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 3,
+                 threshold: float = 0.8, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        self._buckets = [dict() for _ in range(bands)]
+        self._signatures = {}
+        self._payloads = {}
+        self._lock = threading.Lock()
+        self._log_path = None
+        self._log_offset = 0
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key):
+        return key in self._signatures
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('_lock', '_log_path', '_log_offset'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._log_path = None
+        self._log_offset = 0
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Hash every run of `shingle_size` consecutive words to a 31-bit integer."""
+        words = re.findall(r"[a-z0-9+#]+", text.lower())
+        size = min(self.shingle_size, len(words)) or 1
+        grams = {' '.join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        return np.fromiter((zlib.crc32(g.encode('utf-8')) & 0x7FFFFFFF for g in grams),
+                           dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text, all permutations at once."""
+        hashes = self.shingles(text)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: str, text: str, payload: Any = None, log: bool = True) -> np.ndarray:
+        """
+        Add a document to the index, replacing any earlier document with the same key.
+
+        Args:
+            key (str): Unique ID of the document, e.g. a session ID
+            text (str): The document's text
+            payload (Any, optional): Data to return with query results, e.g. a cached evaluation
+            log (bool): Append the document to the index's log, if it has one
+
+        Returns:
+            np.ndarray: The document's signature
+        """
+        signature = self.signature(text)
+        with self._lock:
+            self._insert(key, signature, payload)
+        if log and self._log_path:
+            record = pickle.dumps((key, signature, payload), protocol=pickle.HIGHEST_PROTOCOL)
+            # One write to an O_APPEND file, so records from concurrent processes never interleave
+            fd = os.open(self._log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, record)
+            finally:
+                os.close(fd)
+        return signature
+
+    def _insert(self, key: str, signature: np.ndarray, payload: Any):
+        if key in self._signatures:
+            self._remove(key)
+        self._signatures[key] = signature
+        self._payloads[key] = payload
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band, []).append(key)
+
+    def _remove(self, key: str):
+        signature = self._signatures.pop(key)
+        self._payloads.pop(key, None)
+        for bucket, band in zip(self._buckets, self._band_keys(signature)):
+            keys = bucket.get(band, [])
+            if key in keys:
+                keys.remove(key)
+            if not keys:
+                bucket.pop(band, None)
+
+    def query(self, text: str, threshold: float = None, exclude: str = None) -> List[Tuple[str, float, Any]]:
+        """
+        Find stored documents that are near-duplicates of a text.
+
+        Args:
+            text (str): Text to look up
+            threshold (float, optional): Minimum estimated Jaccard similarity; defaults to the index's
+            exclude (str, optional): Key to leave out of the results, e.g. the document itself
+
+        Returns:
+            list: (key, similarity, payload) tuples, most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for bucket, band in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(band, ()))
+            candidates.discard(exclude)
+            results = []
+            for key in candidates:
+                similarity = float(np.mean(self._signatures[key] == signature))
+                if similarity >= threshold:
+                    results.append((key, similarity, self._payloads.get(key)))
+        return sorted(results, key=lambda r: r[1], reverse=True)
+
+    def attach_log(self, log_path: str):
+        """Replay the documents appended to a log and append future additions to it."""
+        os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+        self._log_path = log_path
+        self._log_offset = 0
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Add documents other processes have appended to the log since the last refresh.
+
+        Returns:
+            int: Number of records read
+        """
+        if not self._log_path:
+            return 0
+        count = 0
+        try:
+            with open(self._log_path, 'rb') as f, self._lock:
+                f.seek(self._log_offset)
+                while True:
+                    try:
+                        key, signature, payload = pickle.load(f)
+                    except Exception:
+                        # End of the log, or a record another process is still writing
+                        break
+                    self._insert(key, signature, payload)
+                    self._log_offset = f.tell()
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    def save(self, path: str):
+        """
+        Write a snapshot of the whole index atomically and empty its log.
+
+        Records appended by other processes while this runs are lost, so only use it
+        to compact the log when no interviews are running, e.g. after --rebuild.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with self._lock, open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        if self._log_path:
+            with self._lock:
+                open(self._log_path, 'wb').close()
+                self._log_offset = 0
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'MinHashIndex':
+        """Load a saved index, or create an empty one if there is none."""
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            if os.path.exists(path):
+                print(f"Could not load index {path}, starting a new one: {e}")
+            return cls(**kwargs)
+
+# Shared indexes, loaded from disk on first use
+RESUME_INDEX_PATH = os.path.join(INDEX_DIR, 'resumes.pkl')
+ANSWER_INDEX_PATH = os.path.join(INDEX_DIR, 'answers.pkl')
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def log_path(path: str) -> str:
+    """Path of the append-only log next to an index snapshot, e.g. resumes.pkl -> resumes.log."""
+    return os.path.splitext(path)[0] + '.log'
+
+def _get_index(path: str, **kwargs) -> MinHashIndex:
+    with _indexes_lock:
+        if path not in _indexes:
+            index = MinHashIndex.load(path, **kwargs)
+            index.attach_log(log_path(path))
+            _indexes[path] = index
+        return _indexes[path]
+
+def get_resume_index() -> MinHashIndex:
+    """Index of resume texts, keyed by session ID."""
+    return _get_index(RESUME_INDEX_PATH, shingle_size=5)
+
+def get_answer_index() -> MinHashIndex:
+    """Index of answer transcripts, keyed by '<session_id>/<answer key>'."""
+    # Answers are short, so one changed word moves similarity a lot; use word pairs and narrower bands
+    return _get_index(ANSWER_INDEX_PATH, shingle_size=2, bands=32, threshold=0.7)
+
+def load_indexes():
+    """Load both indexes ahead of time, e.g. in the background while an interview starts."""
+    get_resume_index()
+    get_answer_index()
+
+def find_cached_evaluation(answer: str, question: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the LLM evaluation of an earlier near-identical answer to the same question.
+
+    Args:
+        answer (str): The candidate's answer
+        question (str): The question that was asked
+
+    Returns:
+        Optional[Dict[str, Any]]: The cached feedback, score and tier, or None
+    """
+    for key, similarity, payload in get_answer_index().query(answer):
+        if payload and payload.get('question') == question and payload.get('tier') == 'llm':
+            return payload
+    return None
+
+def index_session(session_id: str, session: Dict[str, Any], save: bool = True) -> Dict[str, Any]:
+    """
+    Find earlier near-duplicates of a session's resume and answers, then add the session to the indexes.
+
+    Args:
+        session_id (str): ID of the session
+        session (dict): The session data, as archived by save_session()
+        save (bool): Append the session to the indexes' logs, so other processes and restarts see it
+
+    Returns:
+        Dict[str, Any]: 'resume' - earlier sessions with a near-duplicate resume, and
+                        'answers' - per answer key, earlier near-duplicate answers to the same question
+    """
+    duplicates = {'resume': [], 'answers': {}}
+    resume_text = (session.get('resume_data') or {}).get('text')
+    if resume_text:
+        resume_index = get_resume_index()
+        # Include sessions that other interviews have finished since this process loaded the index
+        resume_index.refresh()
+        duplicates['resume'] = [{'session_id': key, 'similarity': round(sim, 2)}
+                                for key, sim, _ in resume_index.query(resume_text, exclude=session_id)]
+        resume_index.add(session_id, resume_text, log=save)
+
+    answer_index = get_answer_index()
+    answer_index.refresh()
+    for item in session.get('interview_data') or []:
+        answer = item.get('answer')
+        if not answer:
+            continue
+        key = f"{session_id}/{answer_key(item)}"
+        matches = [{'answer': match_key, 'similarity': round(sim, 2)}
+                   for match_key, sim, payload in answer_index.query(answer, exclude=key)
+                   if payload and payload.get('question') == item.get('question')]
+        if matches:
+            duplicates['answers'][answer_key(item)] = matches
+        answer_index.add(key, answer, {
+            'question': item.get('question'),
+            'feedback': item.get('feedback'),
+            'score': item.get('score'),
+            'tier': item.get('tier')
+        }, log=save)
+    return duplicates
+
+def save_indexes():
+    """Snapshot whichever indexes have been loaded and empty their logs; see MinHashIndex.save()."""
+    with _indexes_lock:
+        loaded = list(_indexes.items())
+    for path, index in loaded:
+        index.save(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate resumes and answers across archived sessions.")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild both indexes from every archived session")
+    parser.add_argument("--session", help="Report earlier near-duplicates of this session")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        for path in (RESUME_INDEX_PATH, ANSWER_INDEX_PATH, log_path(RESUME_INDEX_PATH), log_path(ANSWER_INDEX_PATH)):
+            if os.path.exists(path):
+                os.remove(path)
+        with _indexes_lock:
+            _indexes.clear()
+        flagged = 0
+        count = 0
+        for session_id, session in iter_sessions():
+            duplicates = index_session(session_id, session, save=False)
+            flagged += bool(duplicates['resume'] or duplicates['answers'])
+            count += 1
+        save_indexes()
+        print(f"Indexed {count} sessions; {flagged} have near-duplicates of earlier sessions")
+
+    if args.session:
+        from session_store import load_session
+        session = load_session(args.session)
+        if session is None:
+            parser.error(f"session {args.session} not found")
+        # Session IDs sort by start time, so earlier sessions have smaller IDs
+        resume_text = (session.get('resume_data') or {}).get('text')
+        if resume_text:
+            for key, sim, _ in get_resume_index().query(resume_text, exclude=args.session):
+                if key < args.session:
+                    print(f"Resume matches session {key} ({sim:.0%} similar)")
+        for item in session.get('interview_data') or []:
+            if item.get('answer'):
+                own_key = f"{args.session}/{answer_key(item)}"
+                for key, sim, payload in get_answer_index().query(item['answer'], exclude=own_key):
+                    if key.split('/')[0] >= args.session:
+                        continue
+                    if payload and payload.get('question') == item.get('question'):
+                        print(f"Answer {answer_key(item)} matches {key} ({sim:.0%} similar)")
+
+if __name__ == "__main__":
+    main()
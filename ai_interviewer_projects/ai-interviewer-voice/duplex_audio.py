@@ -0,0 +1,252 @@
+# Full-duplex audio: keep the microphone open while Rick speaks so candidates can barge in
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# After the warm-up, the echo estimate follows louder chunks slowly and decays slowly, so it
+# tracks Rick's voice getting louder without ever catching up with a candidate talking over him
+ECHO_ATTACK = 0.02
+ECHO_DECAY = 0.995
+
+class FullDuplexAudio:
+    """
+    Captures audio continuously, including while text-to-speech is playing.
+
+    A capture thread runs a simple energy-based voice activity detector over every chunk.
+    While Rick is speaking, the microphone also picks up his own voice, so the detection
+    threshold is raised above both the ambient level and an estimate of that echo (echo
+    gating). The estimate is the peak energy of the first moments of Rick's voice in each
+    line, counted from the first word or the first chunk above the ambient level rather than
+    from the call to speak(), since the TTS engine takes a while to start. Afterwards it
+    follows the echo with a slow-rising peak tracker. When
+    the candidate speaks over an interruptible prompt, playback is stopped at the next
+    word and the utterance, including a short pre-roll, becomes the answer to the next
+    listen() call.
+    """
+
+    def __init__(self, recognizer, barge_in_factor: float = 2.5, echo_margin: float = 1.5,
+                 min_speech_seconds: float = 0.15, pause_seconds: float = 0.8, preroll_seconds: float = 0.3,
+                 echo_warmup_seconds: float = 0.3):
+        self.recognizer = recognizer
+        self.barge_in_factor = barge_in_factor
+        self.echo_margin = echo_margin
+        self.min_speech_seconds = min_speech_seconds
+        self.pause_seconds = pause_seconds
+        self.preroll_seconds = preroll_seconds
+        self.echo_warmup_seconds = echo_warmup_seconds
+        self.barge_in = threading.Event()
+
+        self._condition = threading.Condition()
+        self._running = False
+        self._playing = False
+        self._interruptible = False
+        self._echo_level = 0.0
+        self._voice_started = False
+        self._playback_chunks = 0
+        self._loud_chunks = 0
+        self._silent_chunks = 0
+        self._utterance = None
+        self._utterance_started = 0.0
+        self._finished = []
+        self._accept_from = 0.0
+        self._phrase_limit = 20.0
+        self._recorder = None
+
+    def start(self):
+        """Open the microphone and start capturing."""
+        import speech_recognition as sr
+        self._microphone = sr.Microphone()
+        self._source = self._microphone.__enter__()
+        self.sample_rate = self._source.SAMPLE_RATE
+        self.sample_width = self._source.SAMPLE_WIDTH
+        self.chunk_seconds = self._source.CHUNK / self.sample_rate
+        self._preroll = deque(maxlen=max(1, int(self.preroll_seconds / self.chunk_seconds)))
+        self._running = True
+        self._thread = threading.Thread(target=self._capture, name="rick-duplex-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop capturing and release the microphone."""
+        self._running = False
+        self._thread.join(timeout=1)
+        self._microphone.__exit__(None, None, None)
+
+    def _capture(self):
+        while self._running:
+            try:
+                chunk = self._source.stream.read(self._source.CHUNK)
+            except Exception as e:
+                print(f"Full-duplex capture stopped: {e}")
+                self._running = False
+                return
+            samples = np.frombuffer(chunk, dtype=np.int16 if self.sample_width == 2 else np.int8)
+            energy = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))) if samples.size else 0.0
+            with self._condition:
+                self._process(chunk, energy, time.monotonic())
+
+    def _threshold(self) -> float:
+        base = self.recognizer.energy_threshold
+        if self._playing:
+            return max(base * self.barge_in_factor, self._echo_level * self.echo_margin)
+        return base
+
+    def _process(self, chunk: bytes, energy: float, now: float):
+        """Voice activity detection state machine. Caller holds the lock."""
+        if self._utterance is None:
+            self._preroll.append(chunk)
+            if self._playing:
+                if not self._voice_started and energy > self.recognizer.energy_threshold:
+                    self._voice_started = True
+                if self._voice_started:
+                    self._playback_chunks += 1
+                    if self._playback_chunks * self.chunk_seconds <= self.echo_warmup_seconds:
+                        # Only Rick is talking yet: learn how loud his voice is in the microphone
+                        self._echo_level = max(self._echo_level, energy)
+                        self._loud_chunks = 0
+                        return
+                if energy > self._echo_level:
+                    self._echo_level += ECHO_ATTACK * (energy - self._echo_level)
+                else:
+                    self._echo_level *= ECHO_DECAY
+                if not self._interruptible:
+                    self._loud_chunks = 0
+                    return
+        threshold = self._threshold()
+        if self._utterance is None:
+            self._loud_chunks = self._loud_chunks + 1 if energy > threshold else 0
+            if self._loud_chunks * self.chunk_seconds >= self.min_speech_seconds:
+                self._utterance = list(self._preroll)
+                self._utterance_started = now - len(self._preroll) * self.chunk_seconds
+                self._silent_chunks = 0
+                self._preroll.clear()
+                if self._recorder:
+                    for frame in self._utterance:
+                        self._recorder.write(frame)
+                if self._playing:
+                    self.barge_in.set()
+                self._condition.notify_all()
+            return
+
+        self._utterance.append(chunk)
+        if self._recorder:
+            self._recorder.write(chunk)
+        self._silent_chunks = 0 if energy > threshold else self._silent_chunks + 1
+        if (self._silent_chunks * self.chunk_seconds >= self.pause_seconds
+                or now - self._utterance_started >= self._phrase_limit):
+            self._finished.append((self._utterance_started, self._utterance))
+            self._utterance = None
+            self._loud_chunks = 0
+            self._condition.notify_all()
+
+    def _candidate_has_answered(self) -> bool:
+        return self._utterance is not None or any(start >= self._accept_from for start, _ in self._finished)
+
+    def speak(self, text: str, interruptible: bool = True) -> bool:
+        """
+        Speak while capturing; interruptible prompts stop as soon as the candidate talks.
+
+        Args:
+            text (str): What Rick says
+            interruptible (bool): Whether the candidate may talk over this line
+
+        Returns:
+            bool: True if the candidate interrupted or had already started answering
+        """
+        with self._condition:
+            # The candidate is already answering, so skip the rest of the prompt
+            if interruptible and self._candidate_has_answered():
+                return True
+            self.barge_in.clear()
+            self._playing = True
+            self._interruptible = interruptible
+            self._echo_level = 0.0
+            self._voice_started = False
+            self._playback_chunks = 0
+
+        from audio_utils import get_enginge
+        try:
+            engine = get_enginge()
+
+            def on_start(name):
+                with self._condition:
+                    self._voice_started = True
+
+            def on_word(name, location, length):
+                if not self._voice_started:
+                    on_start(name)
+                if self.barge_in.is_set():
+                    engine.stop()
+
+            engine.connect('started-utterance', on_start)
+            engine.connect('started-word', on_word)
+            engine.say(text)
+            engine.runAndWait()
+        except Exception as e:
+            print(f"An error occurred in the speak function: {e}")
+        finally:
+            with self._condition:
+                self._playing = False
+                if not interruptible:
+                    # Anything said before now was not an answer to what comes next
+                    self._accept_from = time.monotonic()
+        return self.barge_in.is_set()
+
+    def listen(self, timeout: float = 15, phrase_time_limit: float = 20, record_to: str = None) -> str:
+        """
+        Return the candidate's next answer, which may have started during the prompt.
+
+        Args:
+            timeout (float): Seconds to wait for the candidate to start speaking
+            phrase_time_limit (float): Maximum length of the answer in seconds
+            record_to (str, optional): Path without extension to stream the answer's audio to
+
+        Returns:
+            str: Recognized text or error message, as audio_utils.listen() returns
+        """
+        import speech_recognition as sr
+
+        recorder = None
+        start_deadline = time.monotonic() + timeout
+        with self._condition:
+            self._phrase_limit = phrase_time_limit
+            self._finished = [u for u in self._finished if u[0] >= self._accept_from]
+            if record_to:
+                from recordings import AnswerRecorder
+                recorder = AnswerRecorder(record_to, self.sample_rate, self.sample_width)
+                for _, frames in self._finished:
+                    for frame in frames:
+                        recorder.write(frame)
+                for frame in self._utterance or []:
+                    recorder.write(frame)
+                self._recorder = recorder
+
+            while not self._finished:
+                if not self._running:
+                    break
+                if self._utterance is None and time.monotonic() >= start_deadline:
+                    break
+                self._condition.wait(0.1)
+
+            frames = [frame for _, utterance in self._finished for frame in utterance]
+            self._finished = []
+            self._recorder = None
+            self._accept_from = time.monotonic()
+            self.barge_in.clear()
+
+        if recorder:
+            recorder.close()
+        if not frames:
+            return "Sorry, I didn't hear anything. Please try again."
+
+        audio = sr.AudioData(b"".join(frames), self.sample_rate, self.sample_width)
+        try:
+            text = self.recognizer.recognize_google(audio)
+            if text and text.strip():
+                return text.strip()
+            return "Sorry, I didn't catch that. Could you please repeat?"
+        except sr.UnknownValueError:
+            return "Sorry, I didn't catch that. Could you please repeat?"
+        except sr.RequestError:
+            return "Sorry, there was an error with speech recognition. Please try again."
@@ -1,72 +1,148 @@
 # Evaluate answers using Ollama
-import ollama
 import json
-from typing import Dict, Any
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Optional
 
-def evaluate_answer(answer: str, question: str = None) -> str:
+from llm_backend import get_backend
+from llm_scheduler import BACKGROUND, LIVE, SPECULATIVE, SUMMARY, get_scheduler
+from prompt_builder import feedback_messages, follow_up_messages, record_usage, session_summary_messages
+
+# Seconds Rick will wait for a follow-up before moving on to the next static question
+FOLLOW_UP_DEADLINE = 2.0
+
+# Seconds after which LLM results are no longer useful, per priority class
+LLM_DEADLINES = {
+    LIVE: float(os.environ.get('RICK_LIVE_DEADLINE', '15')),
+    SPECULATIVE: 30.0,
+    SUMMARY: 90.0,
+    BACKGROUND: None
+}
+
+_STOPWORDS = {
+    'about', 'after', 'also', 'because', 'been', 'being', 'could', 'does', 'doing', 'from',
+    'have', 'having', 'into', 'just', 'like', 'more', 'most', 'much', 'only', 'other', 'over',
+    'really', 'same', 'some', 'such', 'than', 'that', 'their', 'them', 'then', 'there', 'these',
+    'they', 'thing', 'things', 'this', 'those', 'very', 'want', 'were', 'what', 'when', 'where',
+    'which', 'while', 'will', 'with', 'would', 'your', 'yeah', 'know', 'think', 'mean'
+}
+
+def warm_up(model: str = None) -> bool:
+    """
+    Ask every Ollama host to load the model into memory ahead of the first evaluation.
+
+    Args:
+        model (str, optional): Name of the Ollama model to load; defaults to the backend's model
+
+    Returns:
+        bool: True if at least one host loaded the model
+    """
+    try:
+        # A generate request without a prompt only loads the model
+        return get_backend().warm_up(model) > 0
+    except Exception as e:
+        print(f"Ollama warm-up failed: {e}")
+        return False
+
+def llm_feedback(answer: str, question: str = None, priority: str = LIVE) -> str:
     """
-    Evaluate an interview answer using Ollama with Rick's natural interview feedback.
+    Get Rick's natural interview feedback on an answer from the LLM.
     
     Args:
         answer (str): The candidate's answer
         question (str, optional): The question that was asked
+        priority (str): Scheduler priority class of the request
     
     Returns:
         str: Feedback on the answer
+    
+    Raises:
+        Exception: If no LLM host could evaluate the answer
     """
-    try:
-        # Create a prompt for evaluation with Rick's personality
-        if question:
-            prompt = f"""
-            You are Rick, a professional and friendly AI interviewer conducting a real interview. You're providing natural, conversational feedback to a candidate's response.
-            
-            Question: {question}
-            Answer: {answer}
-            
-            Please provide natural, conversational feedback on this answer as if you're in a real interview. Consider:
-            1. Relevance to the question
-            2. Clarity and communication
-            3. Specificity and examples
-            4. Professionalism
-            5. Areas for improvement
-            
-            Provide feedback in 2-3 sentences that sounds natural and conversational. Use a warm, professional tone as if you're a real interviewer giving immediate feedback. Don't use phrases like "Thank you for your answer" or "I noticed you provided" - just give natural feedback.
-            """
-        else:
-            prompt = f"""
-            You are Rick, a professional and friendly AI interviewer conducting a real interview. You're providing natural, conversational feedback to a candidate's response.
-            
-            Answer: {answer}
-            
-            Please provide natural, conversational feedback on this answer as if you're in a real interview. Consider:
-            1. Clarity and communication
-            2. Specificity and examples
-            3. Professionalism
-            4. Areas for improvement
-            
-            Provide feedback in 2-3 sentences that sounds natural and conversational. Use a warm, professional tone as if you're a real interviewer giving immediate feedback. Don't use phrases like "Thank you for your answer" or "I noticed you provided" - just give natural feedback.
-            """
-        
-        # Use Ollama to generate feedback
-        response = ollama.chat(model='llama2', messages=[
-            {
-                'role': 'user',
-                'content': prompt
-            }
-        ])
-        
-        # Extract the feedback from the response
-        feedback = response['message']['content'].strip()
-        
-        # If feedback is too long, truncate it
-        if len(feedback) > 500:
-            feedback = feedback[:497] + "..."
-        
-        return feedback
+    messages = feedback_messages(answer, question)
+    response = get_scheduler().run(get_backend().chat, messages=messages,
+                                   priority=priority, deadline=LLM_DEADLINES[priority])
+    record_usage('feedback', messages, response)
+    
+    # Extract the feedback from the response
+    feedback = response['message']['content'].strip()
+    
+    # If feedback is too long, truncate it
+    if len(feedback) > 500:
+        feedback = feedback[:497] + "..."
+    
+    return feedback
+
+def evaluate_answer_detailed(answer: str, question: str = None, role: str = None, high_stakes: bool = False,
+                             escalation_margin: float = None, priority: str = LIVE,
+                             use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Evaluate an answer with the instant heuristic scorer, escalating to the LLM when needed.
+    
+    Clear-cut answers get templated feedback right away. Ambiguous answers (scores near
+    the pass mark) and high-stakes answers are sent to the LLM, unless a near-duplicate
+    answer to the same question already has LLM feedback.
+    
+    Args:
+        answer (str): The candidate's answer
+        question (str, optional): The question that was asked
+        role (str, optional): Role being interviewed for
+        high_stakes (bool): Always get LLM feedback for this answer
+        escalation_margin (float, optional): Override the configured ESCALATION_MARGIN
+        priority (str): Scheduler priority class for the LLM request, e.g. BACKGROUND for re-scoring
+        use_cache (bool): Reuse the LLM feedback of a near-identical earlier answer; re-scoring must not,
+                          since the archived answer would find its own old feedback
+    
+    Returns:
+        Dict[str, Any]: feedback, score (0-10) and tier ('heuristic', 'cached', 'llm' or 'heuristic_fallback')
+    """
+    from heuristic_scorer import ESCALATION_MARGIN, score_answer
+    
+    first_tier = score_answer(answer, question, role,
+                              ESCALATION_MARGIN if escalation_margin is None else escalation_margin)
+    result = {'feedback': first_tier['feedback'], 'score': first_tier['score'], 'tier': 'heuristic'}
+    if not (first_tier['escalate'] or high_stakes):
+        return result
     
+    # A near-identical answer to the same question was already evaluated by the LLM
+    if question and use_cache:
+        try:
+            from dedup_index import find_cached_evaluation
+            cached = find_cached_evaluation(answer, question)
+        except Exception as e:
+            print(f"Duplicate answer lookup failed: {e}")
+            cached = None
+        if cached:
+            result['feedback'] = cached['feedback']
+            result['tier'] = 'cached'
+            return result
+    
+    try:
+        result['feedback'] = llm_feedback(answer, question, priority)
+        result['tier'] = 'llm'
     except Exception as e:
-        # Fallback feedback if Ollama fails - still natural and conversational
-        return f"Your response shows good understanding of the topic. Consider adding more specific examples from your experience to make it even stronger. That would help demonstrate your practical knowledge."
+        # The heuristic feedback is still specific to this answer
+        print(f"Answer evaluation failed, using heuristic feedback: {e}")
+        result['tier'] = 'heuristic_fallback'
+    return result
+
+def evaluate_answer(answer: str, question: str = None, role: str = None, high_stakes: bool = False) -> str:
+    """
+    Evaluate an interview answer with Rick's natural interview feedback.
+    
+    Args:
+        answer (str): The candidate's answer
+        question (str, optional): The question that was asked
+        role (str, optional): Role being interviewed for
+        high_stakes (bool): Always get LLM feedback for this answer
+    
+    Returns:
+        str: Feedback on the answer
+    """
+    return evaluate_answer_detailed(answer, question, role, high_stakes)['feedback']
 
 def evaluate_interview_session(interview_data: list) -> Dict[str, Any]:
     """
@@ -87,33 +163,11 @@ def evaluate_interview_session(interview_data: list) -> Dict[str, Any]:
         total_length = sum(len(item.get('answer', '')) for item in interview_data)
         avg_length = total_length / total_questions
         
-        # Generate overall feedback with Rick's personality
-        overall_prompt = f"""
-        You are Rick, a professional and friendly AI interviewer providing overall feedback for an interview session.
-        
-        Interview Summary:
-        - Total questions answered: {total_questions}
-        - Average answer length: {avg_length:.0f} characters
-        
-        Individual responses:
-        {chr(10).join([f"Q: {item.get('question', 'N/A')} | A: {item.get('answer', 'N/A')[:100]}..." for item in interview_data])}
-        
-        Please provide overall feedback on the candidate's interview performance. Consider:
-        1. Overall communication skills
-        2. Consistency in responses
-        3. Areas of strength
-        4. Areas for improvement
-        5. Overall impression
-        
-        Provide feedback in 3-4 sentences that sounds natural and conversational. Use a warm, professional tone as if you're wrapping up a real interview. Be encouraging but honest about areas for improvement.
-        """
-        
-        response = ollama.chat(model='llama2', messages=[
-            {
-                'role': 'user',
-                'content': overall_prompt
-            }
-        ])
+        # Every answer is included, condensed as needed to fit the model's context window
+        messages = session_summary_messages(interview_data)
+        response = get_scheduler().run(get_backend().chat, messages=messages,
+                                       priority=SUMMARY, deadline=LLM_DEADLINES[SUMMARY])
+        record_usage('summary', messages, response)
         
         overall_feedback = response['message']['content'].strip()
         
@@ -130,3 +184,157 @@ def evaluate_interview_session(interview_data: list) -> Dict[str, Any]:
             "total_questions": len(interview_data),
             "overall_feedback": "I really enjoyed our conversation today! You showed good potential and I'm confident you'll continue to improve with practice. Your communication skills are developing well."
         }
+
+# Words ending in a period that don't end a sentence, so a preamble is never split off after them
+_ABBREVIATIONS = {'dr', 'mr', 'mrs', 'ms', 'prof', 'st', 'vs', 'etc', 'e.g', 'i.e', 'approx'}
+
+def _strip_preamble(text: str) -> str:
+    """Drop everything up to the last ':' or sentence-ending '.'/'!' before the question."""
+    start = 0
+    for match in re.finditer(r'([.!:])\s+', text):
+        if match.group(1) != ':':
+            # A sentence ends only if the next one starts with a capital and the period isn't an abbreviation
+            if not text[match.end()].isupper():
+                continue
+            words = text[:match.start()].split()
+            if match.group(1) == '.' and words and words[-1].lower().lstrip('("') in _ABBREVIATIONS:
+                continue
+        start = match.end()
+    return text[start:]
+
+def extract_question(reply: str) -> str:
+    """
+    Pull the question Rick should read aloud out of an LLM reply.
+
+    Keeps only the first question, and drops any preamble in front of it such as
+    "Sure! Here's a follow-up question:", whether on the same line or a line of its own.
+
+    Args:
+        reply (str): The model's reply
+
+    Returns:
+        str: The question, or an empty string if the reply has none
+    """
+    for line in reply.replace('*', '').splitlines():
+        if '?' not in line:
+            continue
+        question = line[:line.index('?') + 1]
+        question = _strip_preamble(question)
+        question = question.strip().strip('"\'').strip()
+        if len(question) > 1:
+            return question
+    return ''
+
+def generate_follow_up(question: str, answer: str = None, model: str = None) -> str:
+    """
+    Generate one follow-up question that digs deeper into the candidate's answer.
+
+    Args:
+        question (str): The question that was asked
+        answer (str, optional): The candidate's answer; without it a generic follow-up is generated
+        model (str, optional): Name of the Ollama model to use; defaults to the backend's model
+
+    Returns:
+        str: The follow-up question
+
+    Raises:
+        Exception: If Ollama fails or returns no usable question
+    """
+    messages = follow_up_messages(question, answer)
+    response = get_scheduler().run(get_backend().chat, model=model, messages=messages,
+                                   priority=SPECULATIVE, deadline=LLM_DEADLINES[SPECULATIVE])
+    record_usage('follow_up', messages, response)
+
+    follow_up = extract_question(response['message']['content'])
+    if not follow_up:
+        raise ValueError("Ollama did not return a follow-up question")
+    return follow_up
+
+class FollowUpEngine:
+    """
+    Speculatively generates follow-up questions so they are ready when Rick needs them.
+
+    A generic follow-up is requested as soon as a question is asked, and a specific one
+    as soon as the answer is transcribed, so both run while the answer is being evaluated.
+    Results are cached per question and answer pattern. The engine returned by
+    get_follow_up_engine() is shared by every interview in the process, so candidates
+    asked the same question reuse each other's generic and similar-answer follow-ups.
+    """
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 256, model: str = None):
+        self.model = model
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rick-follow-up")
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def answer_pattern(answer: str = None, size: int = 6) -> tuple:
+        """Reduce an answer to its most frequent content words, so similar answers share a cache entry."""
+        if not answer:
+            return ()
+        words = [w for w in re.findall(r"[a-z][a-z+#.]{3,}", answer.lower()) if w not in _STOPWORDS]
+        return tuple(sorted(word for word, _ in Counter(words).most_common(size)))
+
+    def prefetch(self, question: str, answer: str = None):
+        """Start generating a follow-up in the background and return its future."""
+        key = (question, self.answer_pattern(answer))
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None and not (future.done() and future.exception()):
+                self._cache.move_to_end(key)
+                return future
+            future = self._executor.submit(generate_follow_up, question, answer, self.model)
+            self._cache[key] = future
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return future
+
+    def get(self, question: str, answer: str = None, deadline: float = FOLLOW_UP_DEADLINE) -> Optional[str]:
+        """
+        Return a follow-up question if one is ready within the deadline.
+
+        Args:
+            question (str): The question that was asked
+            answer (str, optional): The candidate's answer
+            deadline (float): Seconds to wait for the answer-specific follow-up
+
+        Returns:
+            Optional[str]: The follow-up, or None to move on to the next static question
+        """
+        try:
+            return self.prefetch(question, answer).result(timeout=deadline)
+        except FutureTimeoutError:
+            pass
+        except Exception as e:
+            print(f"Follow-up generation failed: {e}")
+
+        # Fall back to the generic follow-up only if it is already done
+        with self._lock:
+            generic = self._cache.get((question, ()))
+        if generic is not None and generic.done() and not generic.cancelled() and not generic.exception():
+            return generic.result()
+        return None
+
+    def cancel_pending(self):
+        """Drop generations that haven't started yet, e.g. when an interview ends."""
+        with self._lock:
+            for key, future in list(self._cache.items()):
+                if future.cancel():
+                    del self._cache[key]
+
+    def shutdown(self):
+        """Stop the worker threads without waiting for pending generations."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+# Shared follow-up engine, created on first use
+_follow_up_engine = None
+_follow_up_lock = threading.Lock()
+
+def get_follow_up_engine() -> FollowUpEngine:
+    """Return the shared follow-up engine, creating it on first use."""
+    global _follow_up_engine
+    with _follow_up_lock:
+        if _follow_up_engine is None:
+            _follow_up_engine = FollowUpEngine()
+        return _follow_up_engine
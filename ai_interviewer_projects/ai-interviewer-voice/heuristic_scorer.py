@@ -0,0 +1,157 @@
+# Instant first-tier answer scoring with NumPy features
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import numpy as np
+
+from resume_parser import get_resume_parser
+
+# Scores are on a 0-10 scale; answers scoring within ESCALATION_MARGIN of PASS_MARK
+# are ambiguous and get a full LLM evaluation. A margin of 10 sends everything to the LLM.
+PASS_MARK = 5.0
+ESCALATION_MARGIN = float(os.environ.get('RICK_ESCALATION_MARGIN', '1.5'))
+
+# Number of words at which an answer gets full marks for length
+IDEAL_WORDS = 80
+# Number of words needed to judge fluency; shorter answers get proportionally less credit for it
+FLUENCY_WORDS = 20
+# Scores below this get the "build on that" feedback instead of praise for their best feature
+WEAK_SCORE = 3.0
+
+FEATURES = ('length', 'topic_coverage', 'role_keywords', 'fluency', 'examples')
+# Relative importance of each feature; sums to 1 so the weighted score stays in 0-1
+WEIGHTS = np.array([0.25, 0.25, 0.15, 0.1, 0.25])
+
+FILLER_WORDS = np.array(['um', 'uh', 'er', 'ah', 'hmm', 'like', 'basically', 'actually',
+                         'literally', 'kinda', 'sorta', 'stuff', 'whatever'])
+EXAMPLE_MARKERS = np.array(['example', 'instance', 'project', 'built', 'implemented', 'designed',
+                            'developed', 'led', 'reduced', 'improved', 'increased', 'migrated',
+                            'deployed', 'created', 'automated', 'optimized', 'launched', 'fixed'])
+STOPWORDS = np.array(['tell', 'about', 'your', 'experience', 'with', 'what', 'whats', "what's", 'how',
+                      'would', 'you', 'do', 'the', 'and', 'for', 'like', 'describe', 'time', 'when',
+                      'have', 'had', 'that', 'this', 'from', 'into', 'approach', 'some', 'are', 'a',
+                      'an', 'in', 'of', 'to', 'or', 'on', 'is', 'me', 'through', 'walk'])
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#.']+")
+
+def _tokens(text: str) -> np.ndarray:
+    return np.array([t.strip(".'") for t in _TOKEN_PATTERN.findall(text.lower())] or [''])
+
+@lru_cache(maxsize=512)
+def _topic_terms(question: str) -> np.ndarray:
+    """Content words of a question, e.g. 'cloud', 'platforms', 'aws' for a cloud question."""
+    terms = np.unique(_tokens(question))
+    terms = terms[np.char.str_len(terms) > 2]
+    return np.setdiff1d(terms, STOPWORDS)
+
+@lru_cache(maxsize=16)
+def _role_keywords(role: str) -> np.ndarray:
+    return np.array(get_resume_parser().skills_keywords.get(role, []) or [''])
+
+def extract_features(answer: str, question: str = None, role: str = None) -> np.ndarray:
+    """
+    Compute the scoring features of an answer, each normalized to 0-1.
+
+    Args:
+        answer (str): The candidate's answer
+        question (str, optional): The question that was asked
+        role (str, optional): Role being interviewed for, for the ResumeParser skill keywords
+
+    Returns:
+        np.ndarray: One value per entry in FEATURES
+    """
+    tokens = _tokens(answer)
+    word_count = int(np.count_nonzero(tokens))
+    if word_count == 0:
+        return np.zeros(len(FEATURES))
+
+    length = min(word_count / IDEAL_WORDS, 1.0)
+
+    terms = _topic_terms(question) if question else np.array([])
+    topic_coverage = float(np.isin(terms, tokens).mean()) if terms.size else 0.5
+
+    if role:
+        keywords = _role_keywords(role)
+        # Keywords can be multi-word ("rest api"), so search the text rather than the tokens
+        padded = f" {' '.join(tokens)} "
+        hits = np.char.find(padded, np.char.add(np.char.add(' ', keywords), ' ')) >= 0
+        role_keywords = min(np.count_nonzero(hits) / 3, 1.0)
+    else:
+        role_keywords = 0.5
+
+    filler_rate = np.isin(tokens, FILLER_WORDS).mean()
+    # A one-word answer has no fillers but says nothing about fluency
+    fluency = (1.0 - min(filler_rate * 5, 1.0)) * min(word_count / FLUENCY_WORDS, 1.0)
+
+    has_number = bool(np.any(np.char.isdigit(tokens)))
+    examples = min(np.count_nonzero(np.isin(tokens, EXAMPLE_MARKERS)) / 3 + 0.35 * has_number, 1.0)
+
+    return np.array([length, topic_coverage, role_keywords, fluency, examples])
+
+def _feedback(features: np.ndarray, score: float) -> str:
+    """Templated feedback naming the strongest and weakest aspects of the answer."""
+    strengths = {
+        'length': "You gave a well-developed answer",
+        'topic_coverage': "You addressed the question directly",
+        'role_keywords': "You brought in relevant technical skills",
+        'fluency': "You spoke clearly and confidently",
+        'examples': "The concrete examples made your answer convincing"
+    }
+    improvements = {
+        'length': "try expanding your answer a bit more so I can understand your full thinking",
+        'topic_coverage': "make sure you tie your answer back to what the question asked",
+        'role_keywords': "mention the specific tools and technologies you used for this kind of role",
+        'fluency': "try pausing instead of using filler words, which will make you sound more confident",
+        'examples': "a specific example from your own experience, ideally with a measurable result, would make it stronger"
+    }
+    best = FEATURES[int(np.argmax(features))]
+    worst = FEATURES[int(np.argmin(features))]
+    if score >= 8:
+        return f"{strengths[best]}. That was a strong response overall."
+    if score < WEAK_SCORE:
+        return f"Let's build on that. To give me a fuller picture, {improvements[worst]}."
+    return f"{strengths[best]}. To make it even better, {improvements[worst]}."
+
+def score_answers(answers: List[str], questions: List[str] = None, roles: List[str] = None) -> np.ndarray:
+    """
+    Score many answers at once.
+
+    Args:
+        answers (list): Candidate answers
+        questions (list, optional): The question for each answer
+        roles (list, optional): The role for each answer
+
+    Returns:
+        np.ndarray: Scores from 0 to 10, one per answer
+    """
+    questions = questions or [None] * len(answers)
+    roles = roles or [None] * len(answers)
+    if not answers:
+        return np.zeros(0)
+    matrix = np.vstack([extract_features(a, q, r) for a, q, r in zip(answers, questions, roles)])
+    return np.round(10 * matrix @ WEIGHTS, 1)
+
+def score_answer(answer: str, question: str = None, role: str = None,
+                 escalation_margin: float = ESCALATION_MARGIN) -> Dict[str, Any]:
+    """
+    Score an answer in milliseconds and decide whether it needs an LLM evaluation.
+
+    Args:
+        answer (str): The candidate's answer
+        question (str, optional): The question that was asked
+        role (str, optional): Role being interviewed for
+        escalation_margin (float): Scores within this distance of PASS_MARK are ambiguous
+
+    Returns:
+        Dict[str, Any]: score (0-10), features, templated feedback and whether to escalate
+    """
+    features = extract_features(answer, question, role)
+    score = round(float(10 * features @ WEIGHTS), 1)
+    return {
+        'score': score,
+        'features': dict(zip(FEATURES, np.round(features, 2).tolist())),
+        'feedback': _feedback(features, score),
+        'escalate': abs(score - PASS_MARK) <= escalation_margin
+    }
@@ -0,0 +1,232 @@
+# Pool of Ollama-compatible hosts used for all LLM requests
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Comma-separated list of hosts, e.g. "http://gpu1:11434,http://gpu2:11434"
+DEFAULT_HOSTS = os.environ.get('OLLAMA_HOSTS', os.environ.get('OLLAMA_HOST', 'http://localhost:11434'))
+DEFAULT_MODEL = os.environ.get('OLLAMA_MODEL', 'llama2')
+REQUEST_TIMEOUT = float(os.environ.get('OLLAMA_TIMEOUT', '60'))
+HEALTH_CHECK_INTERVAL = float(os.environ.get('OLLAMA_HEALTH_INTERVAL', '10'))
+
+class LLMBackendError(Exception):
+    """Raised when no host in the pool could serve a request."""
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a host after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and the host is
+    skipped. Once `reset_timeout` seconds have passed a single trial request is let
+    through (half-open); its outcome closes the breaker again or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+class LLMHost:
+    """One Ollama-compatible server, with its own client, breaker and load counters."""
+
+    def __init__(self, url: str, timeout: float = REQUEST_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.breaker = CircuitBreaker()
+        self.healthy = True
+        self.outstanding = 0
+        self.completed = 0
+        self.failed = 0
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import ollama
+            self._client = ollama.Client(host=self.url, timeout=self.timeout)
+        return self._client
+
+    def available(self) -> bool:
+        return self.healthy and self.breaker.state != 'open'
+
+class LLMBackendPool:
+    """
+    Spreads LLM requests across hosts using least-outstanding-requests balancing.
+
+    Each request goes to the healthy host with the fewest requests in flight. If it
+    fails or times out, the request is retried on the next best host, and the failing
+    host's circuit breaker is updated. A background thread checks host health.
+    """
+
+    def __init__(self, hosts: List[str], model: str = DEFAULT_MODEL, timeout: float = REQUEST_TIMEOUT,
+                 health_check_interval: float = HEALTH_CHECK_INTERVAL):
+        if not hosts:
+            raise ValueError("LLMBackendPool needs at least one host")
+        self.model = model
+        self.hosts = [LLMHost(url, timeout) for url in hosts]
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._health_thread = None
+        self._stopped = threading.Event()
+
+    def _acquire(self, exclude) -> Optional[LLMHost]:
+        """Pick the least loaded usable host and count the request against it."""
+        with self._lock:
+            candidates = [h for h in self.hosts if h not in exclude and h.available()]
+            # Ties go to the host that has completed the fewest requests, so load stays even
+            for host in sorted(candidates, key=lambda h: (h.outstanding, h.completed)):
+                if host.breaker.allow_request():
+                    host.outstanding += 1
+                    return host
+            return None
+
+    def _release(self, host: LLMHost, ok: bool):
+        with self._lock:
+            host.outstanding -= 1
+            if ok:
+                host.completed += 1
+            else:
+                host.failed += 1
+        if ok:
+            host.breaker.record_success()
+        else:
+            host.breaker.record_failure()
+
+    def _request(self, method: str, **kwargs) -> Any:
+        tried = set()
+        last_error = None
+        while True:
+            host = self._acquire(tried)
+            if host is None:
+                break
+            tried.add(host)
+            try:
+                response = getattr(host.client, method)(**kwargs)
+            except Exception as e:
+                self._release(host, ok=False)
+                last_error = e
+                print(f"LLM request to {host.url} failed: {e}")
+                continue
+            self._release(host, ok=True)
+            return response
+        raise LLMBackendError(f"No LLM host could serve the request (last error: {last_error})")
+
+    def chat(self, messages: List[Dict[str, str]], model: str = None, **kwargs) -> Any:
+        """
+        Send a chat request to the least loaded healthy host, failing over to the others.
+
+        Args:
+            messages (list): Chat messages in Ollama format
+            model (str, optional): Model to use; defaults to the pool's model
+
+        Returns:
+            The Ollama chat response
+
+        Raises:
+            LLMBackendError: If every usable host failed
+        """
+        return self._request('chat', model=model or self.model, messages=messages, **kwargs)
+
+    def generate(self, prompt: str = '', model: str = None, **kwargs) -> Any:
+        """Send a generate request to the least loaded healthy host, failing over to the others."""
+        return self._request('generate', model=model or self.model, prompt=prompt, **kwargs)
+
+    def warm_up(self, model: str = None, keep_alive: str = '30m') -> int:
+        """Load the model on every host; returns how many hosts loaded it."""
+        loaded = 0
+        for host in self.hosts:
+            try:
+                host.client.generate(model=model or self.model, keep_alive=keep_alive)
+                loaded += 1
+            except Exception as e:
+                print(f"Warm-up of {host.url} failed: {e}")
+        return loaded
+
+    def check_health(self):
+        """Probe every host once and mark it healthy or not."""
+        for host in self.hosts:
+            try:
+                host.client.list()
+                if not host.healthy:
+                    print(f"LLM host {host.url} is healthy again")
+                host.healthy = True
+            except Exception as e:
+                if host.healthy:
+                    print(f"LLM host {host.url} failed its health check: {e}")
+                host.healthy = False
+
+    def start_health_checks(self):
+        """Run check_health() periodically on a daemon thread."""
+        if self._health_thread is not None:
+            return
+
+        def loop():
+            while not self._stopped.wait(self.health_check_interval):
+                self.check_health()
+
+        self._health_thread = threading.Thread(target=loop, name="rick-llm-health", daemon=True)
+        self._health_thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-host load and health counters."""
+        with self._lock:
+            return [{
+                'host': h.url,
+                'healthy': h.healthy,
+                'breaker': h.breaker.state,
+                'outstanding': h.outstanding,
+                'completed': h.completed,
+                'failed': h.failed
+            } for h in self.hosts]
+
+# Shared pool, created on first use from the OLLAMA_HOSTS environment variable
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_backend() -> LLMBackendPool:
+    """Return the shared backend pool, creating it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            hosts = [h.strip() for h in DEFAULT_HOSTS.split(',') if h.strip()]
+            _backend = LLMBackendPool(hosts)
+            _backend.start_health_checks()
+        return _backend
@@ -0,0 +1,214 @@
+# Priority scheduling of LLM work across live turns and background jobs
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict
+
+# Priority classes, most urgent first, with the number of requests each may run at once
+LIVE = 'live'                # feedback during a candidate's turn
+SPECULATIVE = 'speculative'  # follow-up questions generated ahead of time
+SUMMARY = 'summary'          # end-of-interview evaluation
+BACKGROUND = 'background'    # reports, re-scoring and other batch work
+PRIORITY_CLASSES = (LIVE, SPECULATIVE, SUMMARY, BACKGROUND)
+DEFAULT_CLASS_LIMITS = {LIVE: 4, SPECULATIVE: 2, SUMMARY: 2, BACKGROUND: 2}
+
+# Requests the LLM backend can serve at once, across all classes
+TOTAL_CONCURRENCY = int(os.environ.get('RICK_LLM_CONCURRENCY', '4'))
+# Workers that only live requests may use, so other classes together can never fill every slot
+LIVE_RESERVE = int(os.environ.get('RICK_LIVE_RESERVE', '1'))
+
+# How many recent wait times to keep per class for the metrics
+WAIT_SAMPLES = 1000
+
+class DeadlineExceeded(Exception):
+    """Raised when an LLM request could not be completed before its deadline."""
+
+class _Job:
+    __slots__ = ('fn', 'args', 'kwargs', 'future', 'priority', 'deadline', 'submitted_at')
+
+    def __init__(self, fn, args, kwargs, priority, deadline):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.priority = priority
+        self.deadline = deadline
+        self.submitted_at = time.monotonic()
+
+class LLMScheduler:
+    """
+    Runs LLM requests on a fixed pool of workers, most urgent class first.
+
+    Each priority class has its own concurrency limit, and `live_reserve` workers are kept
+    for live requests alone, so other work can never occupy every worker while a live
+    candidate is waiting. Within a class, requests with the
+    earliest deadline go first. A request still queued when its deadline passes is
+    dropped rather than run late, and run() gives up waiting at the deadline so the
+    caller can fall back gracefully.
+    """
+
+    def __init__(self, total_concurrency: int = TOTAL_CONCURRENCY, class_limits: Dict[str, int] = None,
+                 live_reserve: int = LIVE_RESERVE):
+        self.total_concurrency = total_concurrency
+        self.class_limits = dict(DEFAULT_CLASS_LIMITS, **(class_limits or {}))
+        # With a single worker nothing can be reserved; other classes still need a slot
+        self.live_reserve = max(0, min(live_reserve, total_concurrency - 1))
+        self._queues = {name: [] for name in PRIORITY_CLASSES}
+        self._running = {name: 0 for name in PRIORITY_CLASSES}
+        self._counters = {name: {'submitted': 0, 'completed': 0, 'failed': 0, 'expired': 0}
+                          for name in PRIORITY_CLASSES}
+        self._waits = {name: deque(maxlen=WAIT_SAMPLES) for name in PRIORITY_CLASSES}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._workers = []
+
+    def _start_workers(self):
+        while len(self._workers) < self.total_concurrency:
+            worker = threading.Thread(target=self._work, name=f"rick-llm-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def submit(self, fn: Callable, *args, priority: str = BACKGROUND, deadline: float = None, **kwargs) -> Future:
+        """
+        Queue an LLM request.
+
+        Args:
+            fn (callable): Function making the request, e.g. get_backend().chat
+            priority (str): One of PRIORITY_CLASSES
+            deadline (float, optional): Seconds from now after which the result is no longer useful
+
+        Returns:
+            Future: Resolves to fn's result, or fails with DeadlineExceeded
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority}")
+        job = _Job(fn, args, kwargs, priority, time.monotonic() + deadline if deadline is not None else None)
+        with self._condition:
+            self._start_workers()
+            heapq.heappush(self._queues[priority],
+                           (job.deadline if job.deadline is not None else math.inf, next(self._sequence), job))
+            self._counters[priority]['submitted'] += 1
+            self._condition.notify()
+        return job.future
+
+    def run(self, fn: Callable, *args, priority: str = BACKGROUND, deadline: float = None, **kwargs) -> Any:
+        """
+        Queue an LLM request and wait for its result.
+
+        Raises:
+            DeadlineExceeded: If the result isn't ready before the deadline
+        """
+        future = self.submit(fn, *args, priority=priority, deadline=deadline, **kwargs)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeoutError:
+            # Dropped from the queue if it hasn't started; if it has, its result is ignored
+            if future.cancel():
+                self._withdraw(priority, future)
+            raise DeadlineExceeded(f"{priority} LLM request missed its {deadline:.1f}s deadline")
+
+    def _withdraw(self, priority: str, future: Future):
+        """Remove a cancelled request from its queue so it no longer counts as queued."""
+        with self._condition:
+            queue = self._queues[priority]
+            for i, (_, _, job) in enumerate(queue):
+                if job.future is future:
+                    queue[i] = queue[-1]
+                    queue.pop()
+                    heapq.heapify(queue)
+                    self._counters[priority]['expired'] += 1
+                    return
+
+    def _next_job(self):
+        """Pop the most urgent runnable job, expiring any whose deadline has passed. Caller holds the lock."""
+        now = time.monotonic()
+        non_live_running = sum(count for name, count in self._running.items() if name != LIVE)
+        for name in PRIORITY_CLASSES:
+            if name != LIVE and non_live_running >= self.total_concurrency - self.live_reserve:
+                break
+            queue = self._queues[name]
+            while queue and self._running[name] < self.class_limits[name]:
+                _, _, job = heapq.heappop(queue)
+                if job.deadline is not None and job.deadline <= now:
+                    self._counters[name]['expired'] += 1
+                    if job.future.set_running_or_notify_cancel():
+                        job.future.set_exception(DeadlineExceeded(f"{name} LLM request expired in the queue"))
+                    continue
+                if not job.future.set_running_or_notify_cancel():
+                    # The caller already gave up on it
+                    self._counters[name]['expired'] += 1
+                    continue
+                self._running[name] += 1
+                self._waits[name].append(now - job.submitted_at)
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    self._condition.wait()
+                    job = self._next_job()
+            try:
+                job.future.set_result(job.fn(*job.args, **job.kwargs))
+                outcome = 'completed'
+            except BaseException as e:
+                job.future.set_exception(e)
+                outcome = 'failed'
+            with self._condition:
+                self._running[job.priority] -= 1
+                self._counters[job.priority][outcome] += 1
+                # A slot in this class freed up; wake everyone so the most urgent class gets it
+                self._condition.notify_all()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-class queue depth, running requests, counters and queue wait times in milliseconds."""
+        with self._condition:
+            result = {}
+            for name in PRIORITY_CLASSES:
+                waits = sorted(self._waits[name])
+                result[name] = dict(
+                    self._counters[name],
+                    queued=len(self._queues[name]),
+                    running=self._running[name],
+                    limit=self.class_limits[name] if name == LIVE else
+                    min(self.class_limits[name], self.total_concurrency - self.live_reserve),
+                    wait_ms_mean=round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                    wait_ms_p95=round(1000 * waits[max(0, math.ceil(len(waits) * 0.95) - 1)], 1) if waits else 0.0
+                )
+            return result
+
+    def format_metrics(self) -> str:
+        """One line per priority class, for logging."""
+        return "\n".join(
+            f"{name:>11}: queued {m['queued']}, running {m['running']}/{m['limit']}, "
+            f"done {m['completed']}, failed {m['failed']}, expired {m['expired']}, "
+            f"wait mean {m['wait_ms_mean']} ms, p95 {m['wait_ms_p95']} ms"
+            for name, m in self.metrics().items()
+        )
+
+# Shared scheduler, created on first use
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def configure_scheduler(total_concurrency: int = TOTAL_CONCURRENCY, class_limits: Dict[str, int] = None,
+                        live_reserve: int = LIVE_RESERVE) -> LLMScheduler:
+    """Replace the shared scheduler, e.g. to give a batch job more background capacity."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = LLMScheduler(total_concurrency, class_limits, live_reserve)
+        return _scheduler
+
+def get_scheduler() -> LLMScheduler:
+    """Return the shared scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
@@ -1,27 +1,64 @@
 # Main voice-only bot logic
+import argparse
 import os
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from audio_utils import speak, listen
-from evaluator import evaluate_answer, evaluate_interview_session
+from audio_utils import speak, listen, prepare_microphone, enable_full_duplex
+from evaluator import evaluate_answer_detailed, evaluate_interview_session, warm_up, get_follow_up_engine
 from questions import get_questions_for_role, get_available_roles
-from resume_parser import resume_parser
-from report_writer import write_report
+from session_store import new_session_id, answer_recording_base, save_session
+
+# Seconds Rick waits for a resume the candidate is dropping into the inbox during the interview
+RESUME_WAIT_SECONDS = 15
 
 class AIInterviewAgent:
-    def __init__(self):
+    def __init__(self, full_duplex=False, candidate_id=None):
         self.interview_data = []
         self.current_role = None
         self.resume_data = None
         self.user_name = None
         self.agent_name = "Rick"
+        self.session_id = new_session_id()
+        self._background = None
+        self.follow_ups = get_follow_up_engine()
+        self.full_duplex = full_duplex
+        self.candidate_id = candidate_id
+        self.started_at = time.time()
+    
+    def start_background_init(self):
+        """Calibrate the microphone, load the LLM and start the resume inbox while Rick starts talking."""
+        # Resumes that arrive in the inbox after this belong to this interview
+        self.started_at = time.time()
+        self._background = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rick-init")
+        self._background.submit(self._prepare_audio)
+        self._background.submit(warm_up)
+        self._background.submit(self._load_duplicate_indexes)
+        self._background.submit(self._start_resume_inbox)
+        # Don't block on the tasks; the first listen() waits for calibration itself
+        self._background.shutdown(wait=False)
+    
+    def _prepare_audio(self):
+        if prepare_microphone() and self.full_duplex:
+            enable_full_duplex()
+    
+    def _load_duplicate_indexes(self):
+        from dedup_index import load_indexes
+        load_indexes()
+    
+    def _start_resume_inbox(self):
+        from resume_inbox import get_resume_inbox
+        inbox = get_resume_inbox()
+        if self.candidate_id:
+            inbox.prioritize(self.candidate_id)
     
     def greet_user(self):
         """Rick's personalized greeting and introduction for a real interview experience."""
         speak("Hello! I'm Rick, and I will be conducting your interview today. I'm excited to meet you and learn more about your background and experience!")
         
         # Get user's name - ensure Rick continues even if voice recognition fails
-        speak("What is your name?")
+        speak("What is your name?", interruptible=True)
         
         # Use a more robust approach to get the name
         name = None
@@ -38,7 +75,7 @@ class AIInterviewAgent:
             speak("Pleased to meet you! How are you doing today?")
         
         # Always continue to ask how they're doing - this is crucial for conversation flow
-        speak("How are you doing today?")
+        speak("How are you doing today?", interruptible=True)
         
         # Use a more robust approach to get the response
         response = None
@@ -76,11 +113,15 @@ class AIInterviewAgent:
         # Use the user's name if available
         user_display = self.user_name if self.user_name and self.user_name != "Candidate" else "there"
         
-        speak(f"Now {user_display}, I'd like to understand what role you're interested in. I have several positions available:")
+        # In full-duplex mode the candidate can name a role while the menu is still being read
+        interrupted = speak(f"Now {user_display}, I'd like to understand what role you're interested in. I have several positions available:", interruptible=True)
         for i, role in enumerate(roles, 1):
-            speak(f"{i}. {role_names.get(role, role.replace('_', ' ').title())}")
+            if interrupted:
+                break
+            interrupted = speak(f"{i}. {role_names.get(role, role.replace('_', ' ').title())}", interruptible=True)
         
-        speak("Which role are you most interested in? You can say the number or tell me the role name directly.")
+        if not interrupted:
+            speak("Which role are you most interested in? You can say the number or tell me the role name directly.", interruptible=True)
         
         # Use a more robust approach to get the role selection
         response = None
@@ -113,12 +154,12 @@ class AIInterviewAgent:
         speak("I'll proceed with the Software Development Engineer role, which is a fantastic opportunity!")
         return 'sde'
     
-    def get_voice_response_with_retry(self, context=""):
-        """Get a voice response from the user with proper retry logic."""
+    def get_voice_response_with_retry(self, context="", record_to=None):
+        """Get a voice response from the user with proper retry logic, optionally recording it."""
         max_attempts = 3
         for attempt in range(max_attempts):
             try:
-                response = listen()
+                response = listen(record_to=record_to)
                 # Check if we got a valid response
                 if response and response.lower() not in ["sorry, i didn't catch that", "sorry, i didn't hear anything", "sorry, there was an error", "no response"]:
                     return response
@@ -170,44 +211,78 @@ class AIInterviewAgent:
         return 'sde'
     
     def parse_resume(self):
-        """Parse user's resume if provided - voice-based conversation."""
-        speak("Do you have a resume with you today that you'd like me to review? If yes, please place it in the current directory and say 'yes'. Otherwise, say 'no'.")
-        response = self.get_voice_response_with_retry("resume question").lower()
+        """Review the candidate's resume, parsed in the background by the resume inbox - voice-based conversation."""
+        from resume_inbox import INBOX_DIR, get_resume_inbox, normalize_candidate_id
+        
+        # Only an ID from the command line is trusted to look up a resume filed earlier; a spoken
+        # name can be misheard or shared with another candidate, so without one only resumes dropped
+        # in during this interview are considered, and the candidate confirms the file name
+        self.candidate_id = normalize_candidate_id(self.candidate_id) or None
+        folder = INBOX_DIR.replace('_', ' ')
         
-        if 'yes' in response or 'yeah' in response:
-            # Look for PDF files in current directory
-            pdf_files = [f for f in os.listdir('.') if f.lower().endswith('.pdf')]
+        inbox = None
+        entry = None
+        since = self.started_at
+        try:
+            inbox = get_resume_inbox()
+            since = max(inbox.started_at, self.started_at)
+            if self.candidate_id:
+                entry = inbox.get(self.candidate_id)
+            else:
+                entry = inbox.wait_for_arrival(since)
+        except Exception as e:
+            print(f"Resume inbox unavailable: {e}")
+        
+        if entry and self.candidate_id:
+            speak("I see you've already shared your resume with me, so I've had a chance to review your background.")
+        elif not entry:
+            file_name = f"{self.candidate_id}.pdf" if self.candidate_id else "a PDF or Word file with your name"
+            speak(f"Do you have a resume with you today that you'd like me to review? If yes, please save it as {file_name} in the {folder} folder and say 'yes'. Otherwise, say 'no'.")
+            response = self.get_voice_response_with_retry("resume question").lower()
             
-            if pdf_files:
-                resume_file = pdf_files[0]  # Use the first PDF found
-                speak(f"Perfect! I found {resume_file}. Let me take a moment to review your background.")
+            if 'yes' in response or 'yeah' in response:
+                if inbox and self.candidate_id:
+                    entry = inbox.wait_for(self.candidate_id, timeout=RESUME_WAIT_SECONDS)
+                elif inbox:
+                    entry = inbox.wait_for_arrival(since, timeout=RESUME_WAIT_SECONDS)
+                if not entry:
+                    speak(f"I couldn't find your resume in the {folder} folder. We'll proceed without resume review.")
+            else:
+                speak("No problem at all! We'll proceed with the interview without resume review.")
+        
+        if entry and not self.candidate_id:
+            file_name = os.path.basename(entry['path'])
+            speak(f"I found a resume called {file_name}. Is that yours?")
+            response = self.get_voice_response_with_retry("resume confirmation").lower()
+            if 'yes' in response or 'yeah' in response or 'sure' in response:
+                self.candidate_id = entry['candidate_id']
+            else:
+                speak("Alright, I won't use it. We'll proceed without resume review.")
+                entry = None
+        
+        if entry:
+            self.resume_data = entry['resume_data']
+            if self.resume_data.get('parsed_successfully'):
+                suggested_role = self.resume_data.get('suggested_role', 'sde')
+                speak(f"Based on your resume, I think the {suggested_role.replace('_', ' ').title()} role would be an excellent fit for your background. Would you like to proceed with this role for our interview?")
                 
-                try:
-                    self.resume_data = resume_parser.parse_resume(resume_file)
-                    if self.resume_data.get('parsed_successfully'):
-                        suggested_role = self.resume_data.get('suggested_role', 'sde')
-                        speak(f"Based on your resume, I think the {suggested_role.replace('_', ' ').title()} role would be an excellent fit for your background. Would you like to proceed with this role for our interview?")
-                        
-                        response = self.get_voice_response_with_retry("resume role suggestion").lower()
-                        if 'yes' in response or 'yeah' in response or 'sure' in response:
-                            self.current_role = suggested_role
-                            speak(f"Wonderful! I'll proceed with the {suggested_role.replace('_', ' ').title()} role questions.")
-                        else:
-                            speak("No problem! I'll use your previously selected role then.")
-                    else:
-                        speak("I had a bit of trouble reading your resume, but that's perfectly fine. We can proceed with the interview.")
-                except Exception as e:
-                    speak("I encountered a small issue reading your resume, but that's okay. We can proceed with the interview.")
+                response = self.get_voice_response_with_retry("resume role suggestion").lower()
+                if 'yes' in response or 'yeah' in response or 'sure' in response:
+                    self.current_role = suggested_role
+                    speak(f"Wonderful! I'll proceed with the {suggested_role.replace('_', ' ').title()} role questions.")
+                else:
+                    speak("No problem! I'll use your previously selected role then.")
             else:
-                speak("I couldn't find any PDF files in the current directory. We'll proceed without resume review.")
-        else:
-            speak("No problem at all! We'll proceed with the interview without resume review.")
+                speak("I had a bit of trouble reading your resume, but that's perfectly fine. We can proceed with the interview.")
         
         # Ensure Rick continues talking after resume check
         speak("Now, let's proceed with the interview.")
     
     def run_interview(self):
         """Run the complete voice-based interview process with Rick's personality."""
+        # Warm up audio devices and the LLM in the background during the greeting
+        self.start_background_init()
+        
         # Rick's introduction and greeting (this now includes role selection)
         self.greet_user()
         
@@ -235,17 +310,23 @@ class AIInterviewAgent:
             else:
                 speak("Moving on to our next question.")
             
-            speak(question)
+            speak(question, interruptible=True)
+            # Start on a generic follow-up while the candidate is answering
+            self.follow_ups.prefetch(question)
             
             # Get user's answer with natural conversational flow
-            speak("Please go ahead and share your thoughts.")
-            answer = self.get_voice_response_with_retry(f"question {i}")
+            speak("Please go ahead and share your thoughts.", interruptible=True)
+            answer = self.get_voice_response_with_retry(f"question {i}", record_to=answer_recording_base(self.session_id, i))
             
             if answer and answer.lower() not in ["sorry, i didn't catch that", "sorry, i didn't hear anything", "sorry, there was an error", "no response"]:
+                # Generate the answer-specific follow-up alongside the evaluation
+                self.follow_ups.prefetch(question, answer)
                 speak("Thank you for that detailed response. Let me provide you with some feedback.")
                 
-                # Evaluate the answer
-                feedback = evaluate_answer(answer, question)
+                # Evaluate the answer; the final question always gets full LLM feedback
+                evaluation = evaluate_answer_detailed(answer, question, role=self.current_role,
+                                                      high_stakes=i == len(questions))
+                feedback = evaluation['feedback']
                 speak(feedback)
                 
                 # Store the interview data
@@ -253,29 +334,41 @@ class AIInterviewAgent:
                     'question': question,
                     'answer': answer,
                     'feedback': feedback,
+                    'score': evaluation['score'],
+                    'tier': evaluation['tier'],
                     'question_number': i
                 })
                 
+                self.ask_follow_up(question, answer, i)
+                
                 # Add natural transition to next question
                 if i < len(questions):
                     speak("Thank you. Let's continue with our interview.")
             else:
                 speak("I didn't catch your response clearly. Could you please repeat your answer?")
                 # Give them another chance
-                answer = self.get_voice_response_with_retry(f"question {i} retry")
+                answer = self.get_voice_response_with_retry(f"question {i} retry", record_to=answer_recording_base(self.session_id, i))
                 if answer and answer.lower() not in ["sorry, i didn't catch that", "sorry, i didn't hear anything", "sorry, there was an error", "no response"]:
+                    self.follow_ups.prefetch(question, answer)
                     speak("Thank you for clarifying. Let me provide some feedback.")
-                    feedback = evaluate_answer(answer, question)
+                    evaluation = evaluate_answer_detailed(answer, question, role=self.current_role,
+                                                          high_stakes=i == len(questions))
+                    feedback = evaluation['feedback']
                     speak(feedback)
                     self.interview_data.append({
                         'question': question,
                         'answer': answer,
                         'feedback': feedback,
+                        'score': evaluation['score'],
+                        'tier': evaluation['tier'],
                         'question_number': i
                     })
+                    self.ask_follow_up(question, answer, i)
                 else:
                     speak("I understand. Let's move forward with the next question.")
         
+        self.follow_ups.cancel_pending()
+        
         # Generate final evaluation
         speak("Excellent! We've completed our interview. Let me take a moment to review our conversation and provide you with a comprehensive evaluation.")
         final_evaluation = evaluate_interview_session(self.interview_data)
@@ -292,6 +385,34 @@ class AIInterviewAgent:
         else:
             speak("Thank you again for your time today. I wish you the very best in your career endeavors!")
     
+    def ask_follow_up(self, question, answer, question_number):
+        """Ask a follow-up on the candidate's answer if one is ready in time; otherwise move on."""
+        follow_up = self.follow_ups.get(question, answer)
+        if not follow_up:
+            return
+        
+        speak("I'd like to dig a little deeper into that.")
+        speak(follow_up, interruptible=True)
+        follow_up_answer = self.get_voice_response_with_retry(
+            f"question {question_number} follow-up",
+            record_to=answer_recording_base(self.session_id, question_number, follow_up=True)
+        )
+        if follow_up_answer and follow_up_answer.lower() not in ["sorry, i didn't catch that", "sorry, i didn't hear anything", "sorry, there was an error", "no response"]:
+            evaluation = evaluate_answer_detailed(follow_up_answer, follow_up, role=self.current_role)
+            feedback = evaluation['feedback']
+            speak(feedback)
+            self.interview_data.append({
+                'question': follow_up,
+                'answer': follow_up_answer,
+                'feedback': feedback,
+                'score': evaluation['score'],
+                'tier': evaluation['tier'],
+                'question_number': question_number,
+                'follow_up': True
+            })
+        else:
+            speak("That's alright. Let's keep going.")
+    
     def generate_report(self, final_evaluation):
         """Generate and save the interview report."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -299,6 +420,8 @@ class AIInterviewAgent:
         
         # Prepare data for report
         report_data = {
+            'session_id': self.session_id,
+            'candidate_id': self.candidate_id,
             'user_name': self.user_name,
             'role': self.current_role,
             'date': datetime.now().strftime("%B %d, %Y"),
@@ -307,14 +430,36 @@ class AIInterviewAgent:
             'resume_data': self.resume_data
         }
         
+        # Flag recycled resumes and copy-pasted answers before archiving
+        try:
+            from dedup_index import index_session
+            report_data['near_duplicates'] = index_session(self.session_id, report_data)
+        except Exception as e:
+            print(f"Failed to check session {self.session_id} for duplicates: {e}")
+        
         try:
+            save_session(self.session_id, report_data)
+        except Exception as e:
+            print(f"Failed to archive session {self.session_id}: {e}")
+        
+        try:
+            from report_writer import write_report
             write_report(self.user_name, self.interview_data, filename)
         except Exception as e:
             pass
 
 def main():
     """Main function to run the AI interview agent with Rick."""
-    agent = AIInterviewAgent()
+    parser = argparse.ArgumentParser(description="Run a voice interview with Rick.")
+    parser.add_argument("--full-duplex", action="store_true",
+                        default=os.environ.get('RICK_FULL_DUPLEX', '').lower() in ('1', 'true', 'yes'),
+                        help="Keep the microphone open while Rick speaks so you can interrupt him")
+    parser.add_argument("--candidate-id",
+                        help="Candidate whose resume to look up in the resume inbox; without it, only a resume "
+                             "added during the interview is used, after the candidate confirms its file name")
+    args = parser.parse_args()
+    
+    agent = AIInterviewAgent(full_duplex=args.full_duplex, candidate_id=args.candidate_id)
     agent.run_interview()
 
 if __name__ == "__main__":
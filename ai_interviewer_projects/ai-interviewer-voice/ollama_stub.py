@@ -0,0 +1,158 @@
+# Local stand-in for an Ollama server, for offline testing and benchmarks
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FEEDBACK = ("That was a clear answer with a sensible structure. Adding a concrete example from a "
+            "project you worked on would make it even more convincing.")
+FOLLOW_UP = "Can you walk me through a specific example where you applied that?"
+SUMMARY = ("You communicated clearly throughout and stayed on topic. Your strongest answers were the "
+           "ones with concrete examples, so lean on those more. Keep practicing structured answers.")
+
+class StubConfig:
+    """How the stub behaves: response latency and how often it fails or hangs."""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.2, failure_rate: float = 0.0,
+                 hang_rate: float = 0.0, hang_seconds: float = 120.0, model: str = 'llama2'):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.model = model
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+def _reply_for(prompt: str) -> str:
+    lowered = prompt.lower()
+    if 'follow-up' in lowered:
+        return FOLLOW_UP
+    if 'overall feedback' in lowered:
+        return SUMMARY
+    return FEEDBACK
+
+class StubHandler(BaseHTTPRequestHandler):
+    config = StubConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _simulate(self) -> bool:
+        """Sleep for the configured latency; returns False if this request should fail."""
+        config = self.config
+        config.count_request()
+        roll = random.random()
+        if roll < config.hang_rate:
+            time.sleep(config.hang_seconds)
+        time.sleep(max(0.0, random.gauss(config.latency, config.jitter)))
+        if roll >= config.hang_rate and roll < config.hang_rate + config.failure_rate:
+            self._send_json(503, {'error': 'stub server: simulated failure'})
+            return False
+        return True
+
+    def do_GET(self):
+        if self.path == '/api/tags':
+            self._send_json(200, {'models': [{'name': self.config.model, 'model': self.config.model}]})
+        elif self.path == '/':
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b'Ollama is running')
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': 'invalid JSON'})
+            return
+
+        if self.path == '/api/chat':
+            prompt = '\n'.join(m.get('content', '') for m in request.get('messages', []))
+        elif self.path == '/api/generate':
+            prompt = request.get('prompt', '')
+        else:
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        # A generate request without a prompt just loads the model
+        if self.path == '/api/generate' and not prompt:
+            self._send_json(200, {'model': request.get('model'), 'response': '', 'done': True,
+                                  'created_at': datetime.now(timezone.utc).isoformat()})
+            return
+
+        started = time.perf_counter_ns()
+        if not self._simulate():
+            return
+        reply = _reply_for(prompt)
+        payload = {
+            'model': request.get('model', self.config.model),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'done': True,
+            'done_reason': 'stop',
+            'total_duration': time.perf_counter_ns() - started,
+            'prompt_eval_count': len(prompt.split()),
+            'eval_count': len(reply.split())
+        }
+        if self.path == '/api/chat':
+            payload['message'] = {'role': 'assistant', 'content': reply}
+        else:
+            payload['response'] = reply
+        self._send_json(200, payload)
+
+def start_stub_server(port: int = 0, config: StubConfig = None, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Start a stub server on a background thread.
+
+    Args:
+        port (int): Port to listen on; 0 picks a free port
+        config (StubConfig, optional): Latency and failure behaviour
+        host (str): Interface to bind to
+
+    Returns:
+        ThreadingHTTPServer: The running server; its URL is http://host:server.server_port
+    """
+    handler = type('ConfiguredStubHandler', (StubHandler,), {'config': config or StubConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=f"ollama-stub-{port}", daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub Ollama server that simulates latency and failures.")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean response time in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Standard deviation of the response time")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of requests that stall for --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=120.0)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency, args.jitter, args.failure_rate, args.hang_rate, args.hang_seconds)
+    server = start_stub_server(args.port, config)
+    print(f"Stub Ollama server listening on http://127.0.0.1:{server.server_port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
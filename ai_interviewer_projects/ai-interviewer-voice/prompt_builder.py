@@ -0,0 +1,298 @@
+# Token-budgeted prompt construction for the LLM requests
+import math
+import os
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, List
+
+# Context window of the model and tokens kept free for its reply
+CONTEXT_TOKENS = int(os.environ.get('RICK_CONTEXT_TOKENS', '4096'))
+RESPONSE_TOKENS = 256
+# Most tokens a single answer may take up in a feedback or follow-up prompt
+ANSWER_TOKENS = int(os.environ.get('RICK_ANSWER_TOKENS', '400'))
+# Fewest tokens an answer is cut down to in the session summary, however many there are
+MIN_SUMMARY_ANSWER_TOKENS = 24
+
+# Sent first in every request, byte for byte the same, so the backend can reuse its KV cache
+SYSTEM_PROMPT = (
+    "You are Rick, a professional and friendly AI interviewer conducting a real job interview. "
+    "Speak naturally and conversationally, with a warm, professional tone, as a real interviewer would. "
+    "Be encouraging but honest about areas for improvement. "
+    "Don't use phrases like \"Thank you for your answer\" or \"I noticed you provided\". "
+    "Answers are speech transcripts; long ones are condensed and \"...\" marks where text was left out."
+)
+
+FEEDBACK_TASK = (
+    "Give natural feedback on the candidate's answer as if you're in a real interview. Consider "
+    "relevance to the question, clarity and communication, specificity and examples, professionalism "
+    "and areas for improvement. Reply in 2-3 sentences."
+)
+FOLLOW_UP_TASK = (
+    "Ask exactly one short follow-up question that digs deeper into something specific the candidate "
+    "said. Reply with the question only."
+)
+GENERIC_FOLLOW_UP_TASK = (
+    "Ask exactly one short follow-up question that would reveal more depth about this topic, "
+    "whatever the candidate answered. Reply with the question only."
+)
+SUMMARY_TASK = (
+    "Give overall feedback on the candidate's interview performance, considering overall "
+    "communication skills, consistency in responses, areas of strength, areas for improvement and "
+    "your overall impression. Reply in 3-4 sentences, as if you're wrapping up a real interview."
+)
+
+# Transcripts often have no punctuation, so unpunctuated text is cut into windows of this many words
+WORDS_PER_PASSAGE = 20
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_CONTENT_WORD = re.compile(r"[a-z][a-z0-9+#]{2,}")
+_STOPWORDS = {
+    'the', 'and', 'for', 'you', 'your', 'are', 'was', 'were', 'that', 'this', 'with', 'have', 'had',
+    'what', 'how', 'would', 'about', 'from', 'into', 'they', 'them', 'then', 'there', 'which', 'when',
+    'tell', 'describe', 'experience', 'some', 'also', 'just', 'like', 'really', 'very', 'yeah', 'know'
+}
+
+# Optional tiktoken encoding to count with, e.g. cl100k_base. Off by default: tiktoken downloads
+# the encoding's BPE file on first use unless TIKTOKEN_CACHE_DIR already holds it, and prompts
+# are built on the live path, which must not wait on the network
+TOKENIZER = os.environ.get('RICK_TOKENIZER')
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+def _get_encoding():
+    """Load the configured tiktoken encoding; False if none is configured or it can't be loaded."""
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            _encoding = False
+            if TOKENIZER:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding(TOKENIZER)
+                except Exception as e:
+                    print(f"Tokenizer {TOKENIZER} unavailable, estimating token counts: {e}")
+        return _encoding
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text.
+
+    Uses tiktoken when RICK_TOKENIZER names an encoding. Otherwise each word or punctuation
+    mark counts as one token, plus one for every further six characters of a long word,
+    which is close to what subword tokenizers produce for English.
+
+    Args:
+        text (str): Text to count
+
+    Returns:
+        int: Number of tokens
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(1 + (len(piece) - 1) // 6 for piece in _WORD_PATTERN.findall(text))
+
+def _content_words(text: str) -> set:
+    return {w for w in _CONTENT_WORD.findall(text.lower()) if w not in _STOPWORDS}
+
+def _truncate(text: str, max_tokens: int) -> str:
+    words = text.split()
+    while len(words) > 1 and count_tokens(' '.join(words)) > max_tokens:
+        words = words[:-max(1, len(words) // 10)]
+    return ' '.join(words)
+
+def summarize(text: str, max_tokens: int, query: str = None) -> str:
+    """
+    Shorten a text to a token budget by keeping its most relevant sentences.
+
+    Sentences are ranked by how many content words they share with the query (e.g. the
+    question) and, to a lesser degree, with the rest of the text, then kept in their
+    original order until the budget is used up.
+
+    Args:
+        text (str): Text to shorten, e.g. an answer transcript
+        max_tokens (int): Token budget
+        query (str, optional): Text the kept sentences should be relevant to
+
+    Returns:
+        str: The text itself if it fits, otherwise its extract with "..." between gaps
+    """
+    text = (text or '').strip()
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    passages = _SENTENCE_END.split(text)
+    if len(passages) == 1:
+        words = text.split()
+        passages = [' '.join(words[i:i + WORDS_PER_PASSAGE]) for i in range(0, len(words), WORDS_PER_PASSAGE)]
+
+    query_words = _content_words(query or '')
+    passage_words = [_content_words(p) for p in passages]
+    frequency = {}
+    for words in passage_words:
+        for word in words:
+            frequency[word] = frequency.get(word, 0) + 1
+
+    def relevance(i):
+        words = passage_words[i]
+        centrality = sum(frequency[w] - 1 for w in words) / len(passages)
+        return (2 * len(words & query_words) + centrality) / math.sqrt(len(passages[i].split()) + 1)
+
+    kept = set()
+    used = 0
+    # Allow for a "..." separator after every kept passage
+    separator = count_tokens('...')
+    for i in sorted(range(len(passages)), key=lambda i: (-relevance(i), i)):
+        cost = count_tokens(passages[i]) + separator
+        if used + cost <= max_tokens:
+            kept.add(i)
+            used += cost
+    if not kept:
+        best = max(range(len(passages)), key=lambda i: (relevance(i), -i))
+        return _truncate(passages[best], max_tokens - separator) + ' ...'
+
+    parts = []
+    for i in range(len(passages)):
+        if i in kept:
+            parts.append(passages[i])
+        elif not parts or parts[-1] != '...':
+            parts.append('...')
+    return ' '.join(parts)
+
+def allocate_budget(sizes: List[int], budget: int, minimum: int = 0) -> List[int]:
+    """
+    Split a token budget across items so short items keep everything and long ones share the rest.
+
+    Args:
+        sizes (list): Tokens each item needs in full
+        budget (int): Total tokens available
+        minimum (int): Tokens every item gets even if that overruns the budget
+
+    Returns:
+        list: Tokens allotted to each item, in the same order
+    """
+    allocation = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=sizes.__getitem__)
+    for n, i in enumerate(order):
+        share = remaining // (len(sizes) - n)
+        allocation[i] = min(sizes[i], max(share, minimum))
+        remaining -= allocation[i]
+    return allocation
+
+def _messages(content: str) -> List[Dict[str, str]]:
+    return [
+        {'role': 'system', 'content': SYSTEM_PROMPT},
+        {'role': 'user', 'content': content}
+    ]
+
+def feedback_messages(answer: str, question: str = None) -> List[Dict[str, str]]:
+    """Chat messages asking for Rick's feedback on one answer."""
+    # Fixed instructions before the variable part, so more of the prompt is a shared prefix
+    lines = [FEEDBACK_TASK, '']
+    if question:
+        lines.append(f"Question: {question}")
+    lines.append(f"Answer: {summarize(answer, ANSWER_TOKENS, query=question)}")
+    return _messages('\n'.join(lines))
+
+def follow_up_messages(question: str, answer: str = None) -> List[Dict[str, str]]:
+    """Chat messages asking for one follow-up question, specific to the answer if there is one."""
+    lines = [FOLLOW_UP_TASK if answer else GENERIC_FOLLOW_UP_TASK, '', f"Question: {question}"]
+    if answer:
+        lines.append(f"Answer: {summarize(answer, ANSWER_TOKENS, query=question)}")
+    return _messages('\n'.join(lines))
+
+def session_summary_messages(interview_data: list, context_tokens: int = CONTEXT_TOKENS) -> List[Dict[str, str]]:
+    """
+    Chat messages asking for overall feedback on a session, sized to fit the context window.
+
+    Questions are kept whole; the remaining budget is split across the answers, and answers
+    over their share are condensed to their sentences most relevant to the question.
+
+    Args:
+        interview_data (list): Dictionaries with 'question' and 'answer' keys
+        context_tokens (int): Context window of the model
+
+    Returns:
+        list: The system and user messages
+    """
+    total_length = sum(len(item.get('answer') or '') for item in interview_data)
+    header = (f"{SUMMARY_TASK}\n\nInterview summary:\n"
+              f"- Total questions answered: {len(interview_data)}\n"
+              f"- Average answer length: {total_length / max(len(interview_data), 1):.0f} characters\n\n"
+              f"Individual responses:")
+    questions = [f"Q{n}: {item.get('question') or 'N/A'}" for n, item in enumerate(interview_data, 1)]
+    answers = [item.get('answer') or 'N/A' for item in interview_data]
+
+    # Each response adds "\nA: " and a newline around the question
+    overhead = count_tokens(SYSTEM_PROMPT) + count_tokens(header) + 4 * len(interview_data) + 8
+    budget = context_tokens - RESPONSE_TOKENS - overhead - sum(count_tokens(q) for q in questions)
+    shares = allocate_budget([count_tokens(a) for a in answers], budget, MIN_SUMMARY_ANSWER_TOKENS)
+
+    lines = [header]
+    for item, question, answer, share in zip(interview_data, questions, answers, shares):
+        lines.append(question)
+        lines.append(f"A: {summarize(answer, share, query=item.get('question'))}")
+    return _messages('\n'.join(lines))
+
+# Prompt sizes and prompt-eval times of recent requests, per kind of request
+USAGE_SAMPLES = 1000
+_usage = {}
+_usage_lock = threading.Lock()
+
+def record_usage(kind: str, messages: List[Dict[str, str]], response: Any) -> Dict[str, Any]:
+    """
+    Record the token usage of one LLM request.
+
+    Ollama only counts the prompt tokens it actually evaluated, so when the system prompt
+    is served from its KV cache, prompt_tokens is lower than estimated_tokens.
+
+    Args:
+        kind (str): Kind of request, e.g. 'feedback'
+        messages (list): The messages that were sent
+        response: The backend's chat response
+
+    Returns:
+        Dict[str, Any]: estimated_tokens, prompt_tokens, prompt_eval_ms and output_tokens
+    """
+    get = response.get if hasattr(response, 'get') else (lambda key: None)
+    usage = {
+        'estimated_tokens': sum(count_tokens(m['content']) for m in messages),
+        'prompt_tokens': get('prompt_eval_count'),
+        # Not every backend reports durations; None keeps those requests out of the mean
+        'prompt_eval_ms': get('prompt_eval_duration') / 1e6 if get('prompt_eval_duration') is not None else None,
+        'output_tokens': get('eval_count')
+    }
+    with _usage_lock:
+        _usage.setdefault(kind, deque(maxlen=USAGE_SAMPLES)).append(usage)
+    return usage
+
+def usage_stats() -> Dict[str, Dict[str, float]]:
+    """Per kind of request: number of requests and mean estimated/evaluated prompt tokens and prompt-eval time."""
+    with _usage_lock:
+        samples = {kind: list(records) for kind, records in _usage.items()}
+
+    def mean(records, key):
+        values = [r[key] for r in records if r[key] is not None]
+        return round(sum(values) / len(values), 1) if values else None
+
+    return {kind: {
+        'requests': len(records),
+        'estimated_tokens': mean(records, 'estimated_tokens'),
+        'prompt_tokens': mean(records, 'prompt_tokens'),
+        'prompt_eval_ms': mean(records, 'prompt_eval_ms'),
+        'output_tokens': mean(records, 'output_tokens')
+    } for kind, records in samples.items()}
+
+def format_usage() -> str:
+    """One line per kind of request, for logging."""
+    return "\n".join(
+        f"{kind:>10}: {s['requests']} requests, {s['estimated_tokens']} prompt tokens estimated, "
+        f"{s['prompt_tokens']} evaluated in {s['prompt_eval_ms']} ms, {s['output_tokens']} output tokens (means)"
+        for kind, s in usage_stats().items()
+    )
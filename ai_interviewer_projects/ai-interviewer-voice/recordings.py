@@ -0,0 +1,114 @@
+# Stream answer audio to disk while the candidate speaks
+import threading
+import wave
+
+# Seconds of audio the ring buffer can hold before the disk writer must catch up
+RING_BUFFER_SECONDS = 5
+
+class AnswerRecorder:
+    """
+    Records raw PCM frames into a fixed-size ring buffer and streams them to disk.
+
+    The capture side only copies each chunk into the preallocated buffer; a writer
+    thread hands contiguous memoryview slices of it straight to the encoder. Memory
+    per recording is bounded by the ring size no matter how long the answer is.
+    Audio is written as FLAC when `soundfile` is installed, otherwise as WAV.
+    """
+
+    def __init__(self, base_path: str, sample_rate: int, sample_width: int,
+                 channels: int = 1, buffer_seconds: float = RING_BUFFER_SECONDS):
+        frame_size = sample_width * channels
+        capacity = int(sample_rate * buffer_seconds) * frame_size
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._capacity = capacity
+        self._read_pos = 0
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self.dropped_bytes = 0
+
+        self._sink, self.path = self._open_sink(base_path, sample_rate, sample_width, channels)
+        self._writer = threading.Thread(target=self._drain, name="rick-recorder", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def _open_sink(base_path, sample_rate, sample_width, channels):
+        """Open a FLAC encoder if possible, falling back to a plain WAV writer."""
+        if sample_width == 2:
+            try:
+                import soundfile
+                path = base_path + '.flac'
+                sink = soundfile.SoundFile(path, mode='w', samplerate=sample_rate, channels=channels,
+                                           format='FLAC', subtype='PCM_16')
+                return (lambda data: sink.buffer_write(data, dtype='int16'), sink.close), path
+            except Exception:
+                pass
+
+        path = base_path + '.wav'
+        sink = wave.open(path, 'wb')
+        sink.setnchannels(channels)
+        sink.setsampwidth(sample_width)
+        sink.setframerate(sample_rate)
+        return (sink.writeframesraw, sink.close), path
+
+    def write(self, chunk):
+        """Append a chunk of PCM frames; drops the chunk if the writer has fallen a full buffer behind."""
+        data = memoryview(chunk)
+        length = len(data)
+        with self._condition:
+            if self._closed:
+                return
+            if self._size + length > self._capacity:
+                self.dropped_bytes += length
+                return
+            start = (self._read_pos + self._size) % self._capacity
+            first = min(length, self._capacity - start)
+            self._view[start:start + first] = data[:first]
+            if first < length:
+                self._view[:length - first] = data[first:]
+            self._size += length
+            self._condition.notify()
+
+    def _drain(self):
+        write, close = self._sink
+        while True:
+            with self._condition:
+                while not self._size and not self._closed:
+                    self._condition.wait()
+                if not self._size and self._closed:
+                    break
+                start = self._read_pos
+                length = min(self._size, self._capacity - start)
+
+            # Encode outside the lock so capture never waits on the disk
+            write(self._view[start:start + length])
+
+            with self._condition:
+                self._read_pos = (start + length) % self._capacity
+                self._size -= length
+        close()
+
+    def close(self):
+        """Flush the remaining frames and finalize the audio file."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._writer.join()
+        if self.dropped_bytes:
+            print(f"Recorder fell behind and dropped {self.dropped_bytes} bytes of audio for {self.path}")
+
+class TeeStream:
+    """Wraps a microphone stream so every chunk the recognizer reads is also recorded."""
+
+    def __init__(self, stream, recorder: AnswerRecorder):
+        self._stream = stream
+        self._recorder = recorder
+
+    def read(self, size):
+        chunk = self._stream.read(size)
+        self._recorder.write(chunk)
+        return chunk
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
@@ -0,0 +1,224 @@
+# Offline re-transcription and re-evaluation of archived sessions
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from session_store import answer_key, find_answer_recording, iter_sessions, session_dir
+
+# Directory inside each session that holds the results of reprocessing runs
+REPROCESSED_DIR = 'reprocessed'
+
+def transcribe_recording(path: str, engine: str = 'google') -> Tuple[Optional[str], Optional[str]]:
+    """
+    Transcribe a recorded answer. Runs in a worker process.
+
+    Args:
+        path (str): Path to the FLAC or WAV recording
+        engine (str): speech_recognition engine, e.g. 'google', 'whisper' or 'sphinx'
+
+    Returns:
+        tuple: (transcript, error) - exactly one of them is None
+    """
+    try:
+        import speech_recognition as sr
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(path) as source:
+            audio = recognizer.record(source)
+        text = getattr(recognizer, f'recognize_{engine}')(audio)
+        return (text.strip(), None) if text and text.strip() else (None, "empty transcript")
+    except Exception as e:
+        return None, f"transcription failed: {e}"
+
+def results_path(session_id: str, run_id: str) -> str:
+    """Path of the file holding one run's results for a session, next to the original session."""
+    directory = os.path.join(session_dir(session_id), REPROCESSED_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{run_id}.jsonl")
+
+def load_checkpoint(session_id: str, run_id: str) -> Set[str]:
+    """Return the answers of a session this run has already processed successfully."""
+    path = os.path.join(session_dir(session_id), REPROCESSED_DIR, f"{run_id}.jsonl")
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write leaves a truncated last line
+                continue
+            if not record.get('error'):
+                done.add(record['key'])
+    return done
+
+def iter_jobs(run_id: str, transcribe: bool) -> Iterator[Dict[str, Any]]:
+    """Lazily yield every archived answer that this run still has to process."""
+    for session_id, session in iter_sessions():
+        done = load_checkpoint(session_id, run_id)
+        for item in session.get('interview_data', []):
+            key = answer_key(item)
+            if key in done:
+                continue
+            job = {
+                'session_id': session_id,
+                'key': key,
+                'role': session.get('role'),
+                'question_number': item.get('question_number'),
+                'follow_up': bool(item.get('follow_up')),
+                'question': item.get('question'),
+                'original_answer': item.get('answer'),
+                'original_feedback': item.get('feedback'),
+                'original_score': item.get('score'),
+                'new_answer': None,
+                'new_feedback': None,
+                'new_score': None,
+                'new_tier': None,
+                'error': None
+            }
+            if transcribe:
+                job['recording'] = find_answer_recording(session_id, job['question_number'], job['follow_up'])
+                if not job['recording']:
+                    job['error'] = "no recording"
+            yield job
+
+def evaluate_job(job: Dict[str, Any], force_llm: bool = False) -> Dict[str, Any]:
+    """
+    Re-run evaluation on the new transcript if there is one, otherwise on the original.
+
+    Args:
+        job (dict): The answer being reprocessed
+        force_llm (bool): Send the answer to the LLM even if the heuristic scorer is confident,
+                          e.g. to re-score everything after a prompt change
+
+    Raises:
+        RuntimeError: If the LLM failed and only heuristic feedback is available, so the
+                      answer is retried on the next run
+    """
+    from evaluator import evaluate_answer_detailed
+    from llm_scheduler import BACKGROUND
+    result = evaluate_answer_detailed(job['new_answer'] or job['original_answer'], job['question'],
+                                      role=job['role'], high_stakes=force_llm, priority=BACKGROUND,
+                                      use_cache=False)
+    if result['tier'] == 'heuristic_fallback':
+        raise RuntimeError("LLM unavailable, only heuristic feedback")
+    return result
+
+class Reprocessor:
+    """
+    Streams archived answers through a process pool for STT and a thread pool for LLM requests.
+
+    The number of answers in flight is bounded so memory stays flat on very large archives.
+    Every finished answer is appended to its session's results file, which doubles as the
+    checkpoint: rerunning with the same run ID skips answers that already succeeded.
+    """
+
+    def __init__(self, run_id: str, transcribe: bool, evaluate: bool, engine: str = 'google',
+                 stt_workers: int = None, llm_concurrency: int = 4, force_llm: bool = False):
+        self.run_id = run_id
+        self.transcribe = transcribe
+        self.evaluate = evaluate
+        self.engine = engine
+        self.stt_workers = stt_workers or os.cpu_count() or 1
+        self.llm_concurrency = llm_concurrency
+        self.force_llm = force_llm
+        self.max_in_flight = 2 * (self.stt_workers + self.llm_concurrency)
+        self.processed = 0
+        self.failed = 0
+
+    def run(self):
+        """Process every pending answer and print throughput as it goes."""
+        from llm_scheduler import BACKGROUND, configure_scheduler
+        from prompt_builder import format_usage
+        # This process only does batch work, so let it use the whole LLM concurrency
+        scheduler = configure_scheduler(self.llm_concurrency, {BACKGROUND: self.llm_concurrency}, live_reserve=0)
+        started = time.perf_counter()
+        stt_pool = ProcessPoolExecutor(max_workers=self.stt_workers) if self.transcribe else None
+        llm_pool = ThreadPoolExecutor(max_workers=self.llm_concurrency, thread_name_prefix="rick-reprocess")
+        pending = {}
+        try:
+            for job in iter_jobs(self.run_id, self.transcribe):
+                if job['error']:
+                    self._finish(job)
+                    continue
+                if self.transcribe:
+                    pending[stt_pool.submit(transcribe_recording, job['recording'], self.engine)] = ('stt', job)
+                else:
+                    pending[llm_pool.submit(evaluate_job, job, self.force_llm)] = ('llm', job)
+                while len(pending) >= self.max_in_flight:
+                    self._drain(pending, llm_pool, started)
+            while pending:
+                self._drain(pending, llm_pool, started)
+        finally:
+            if stt_pool:
+                stt_pool.shutdown(cancel_futures=True)
+            llm_pool.shutdown(cancel_futures=True)
+
+        elapsed = time.perf_counter() - started
+        rate = self.processed / elapsed if elapsed else 0.0
+        print(f"Run {self.run_id}: {self.processed} answers processed, {self.failed} failed "
+              f"in {elapsed:.1f}s ({rate:.1f} answers/s)")
+        print(scheduler.format_metrics())
+        print(format_usage())
+
+    def _drain(self, pending, llm_pool, started):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            stage, job = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                job['error'] = f"{stage} failed: {e}"
+                self._finish(job)
+                continue
+
+            if stage == 'stt':
+                job['new_answer'], job['error'] = result
+                if not job['error'] and self.evaluate:
+                    pending[llm_pool.submit(evaluate_job, job, self.force_llm)] = ('llm', job)
+                    continue
+            else:
+                job['new_feedback'] = result['feedback']
+                job['new_score'] = result['score']
+                job['new_tier'] = result['tier']
+            self._finish(job)
+
+            if self.processed % 500 == 0:
+                elapsed = time.perf_counter() - started
+                print(f"  {self.processed} answers ({self.processed / elapsed:.1f}/s)")
+
+    def _finish(self, job: Dict[str, Any]):
+        record = {k: v for k, v in job.items() if k != 'recording'}
+        record['run_id'] = self.run_id
+        record['processed_at'] = datetime.now().isoformat(timespec='seconds')
+        with open(results_path(job['session_id'], self.run_id), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        self.processed += 1
+        if job['error']:
+            self.failed += 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-transcribe and/or re-evaluate archived interview sessions.")
+    parser.add_argument("--run-id", required=True, help="Name of this run; reuse it to resume an interrupted run")
+    parser.add_argument("--transcribe", action="store_true", help="Re-run speech-to-text on the recorded answers")
+    parser.add_argument("--evaluate", action="store_true", help="Re-run answer evaluation")
+    parser.add_argument("--engine", default="google", help="speech_recognition engine to transcribe with")
+    parser.add_argument("--stt-workers", type=int, default=None, help="Processes for transcription (default: CPU count)")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Concurrent evaluation requests")
+    parser.add_argument("--force-llm", action="store_true",
+                        help="Send every answer to the LLM, not just those the heuristic scorer is unsure about")
+    args = parser.parse_args()
+
+    if not (args.transcribe or args.evaluate):
+        parser.error("choose --transcribe, --evaluate or both")
+
+    Reprocessor(args.run_id, args.transcribe, args.evaluate, engine=args.engine,
+                stt_workers=args.stt_workers, llm_concurrency=args.llm_concurrency,
+                force_llm=args.force_llm).run()
+
+if __name__ == "__main__":
+    main()
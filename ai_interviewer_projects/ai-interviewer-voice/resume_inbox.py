@@ -0,0 +1,313 @@
+# Watch a directory for incoming resumes and parse them before the interview needs them
+import argparse
+import heapq
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Directory candidates' resumes are dropped into, named <candidate_id>.pdf or <candidate_id>__<anything>.pdf
+INBOX_DIR = os.environ.get('RICK_RESUME_INBOX', 'resume_inbox')
+# Parsed results are cached here, one JSON file per candidate, so restarts don't re-parse everything
+PARSED_DIR = '_parsed'
+
+# Seconds between directory scans when inotify isn't available
+POLL_INTERVAL = float(os.environ.get('RICK_INBOX_POLL_SECONDS', '1.0'))
+# Files modified more recently than this may still be being copied in, so they wait for the next scan
+SETTLE_SECONDS = 0.5
+
+# Queue priorities: resumes of candidates being interviewed go before the backlog
+URGENT = 0
+NORMAL = 1
+
+def normalize_candidate_id(text: str) -> str:
+    """Turn a name or ID into a candidate ID, e.g. 'Jane Doe' -> 'jane_doe'."""
+    return re.sub(r'[^a-z0-9]+', '_', (text or '').lower()).strip('_')
+
+def candidate_id_from_filename(filename: str) -> str:
+    """Get the candidate ID of a resume file, e.g. 'Jane_Doe__v2.pdf' -> 'jane_doe'."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return normalize_candidate_id(stem.split('__')[0])
+
+class ResumeInbox:
+    """
+    Parses resumes in the background as they arrive in the inbox directory.
+
+    A watcher thread scans the directory with os.scandir and compares each file's
+    modification time and size with what it has seen, so only new or changed files are
+    parsed. With the optional inotify_simple package, scans run as soon as a file
+    is written instead of on the next poll. A worker thread parses queued files one at
+    a time, urgent candidates first, and keeps the latest result per candidate in a dict
+    for O(1) lookup.
+
+    Each result records when its file arrived, so a caller that has no reliable candidate
+    ID can restrict itself to files dropped in after a given moment, e.g. the start of the
+    interview, instead of trusting a name-derived ID that may match someone else's resume.
+    """
+
+    def __init__(self, directory: str = INBOX_DIR, poll_interval: float = POLL_INTERVAL,
+                 check_duplicates: bool = True):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.check_duplicates = check_duplicates
+        self._results = {}
+        self._signatures = {}
+        self._pending = {}
+        self._arrived_at = {}
+        self.started_at = None
+        self._queue = []
+        self._sequence = itertools.count()
+        self._urgent = set()
+        self._condition = threading.Condition()
+        self._running = False
+        self._threads = []
+
+    def start(self) -> 'ResumeInbox':
+        """Load cached results and start watching the directory."""
+        os.makedirs(os.path.join(self.directory, PARSED_DIR), exist_ok=True)
+        self._load_cached()
+        # Files already here are known before start() returns, so anything later is an arrival
+        self.scan()
+        self.started_at = time.time()
+        self._running = True
+        for target, name in ((self._watch, "rick-inbox-watch"), (self._work, "rick-inbox-parse")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop the watcher and worker after the file being parsed, if any."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=self.poll_interval + 1)
+
+    def _cache_path(self, candidate_id: str) -> str:
+        return os.path.join(self.directory, PARSED_DIR, f"{candidate_id}.json")
+
+    def _load_cached(self):
+        parsed_dir = os.path.join(self.directory, PARSED_DIR)
+        for entry in os.scandir(parsed_dir):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable cached resume {entry.path}: {e}")
+                continue
+            with self._condition:
+                self._results[cached['candidate_id']] = cached
+                self._signatures[cached['path']] = tuple(cached['signature'])
+
+    def scan(self) -> int:
+        """
+        Queue new and changed resumes for parsing.
+
+        Returns:
+            int: Number of files queued
+        """
+        from resume_parser import SUPPORTED_EXTENSIONS
+
+        now = time.time()
+        queued = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError as e:
+            print(f"Could not scan resume inbox {self.directory}: {e}")
+            return 0
+        with self._condition:
+            for entry in entries:
+                if not entry.name.lower().endswith(SUPPORTED_EXTENSIONS) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._signatures.get(entry.path) == signature or self._pending.get(entry.path) == signature:
+                    continue
+                if now - stat.st_mtime < SETTLE_SECONDS:
+                    continue
+                candidate_id = candidate_id_from_filename(entry.name)
+                self._pending[entry.path] = signature
+                self._arrived_at[entry.path] = now
+                priority = URGENT if candidate_id in self._urgent else NORMAL
+                heapq.heappush(self._queue, (priority, next(self._sequence), entry.path, signature))
+                queued += 1
+            if queued:
+                self._condition.notify_all()
+        return queued
+
+    def _watch(self):
+        notifier = None
+        try:
+            from inotify_simple import INotify, flags
+            notifier = INotify()
+            notifier.add_watch(self.directory, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE)
+        except Exception:
+            # Not on Linux or not installed; polling alone is fine
+            notifier = None
+
+        while self._running:
+            self.scan()
+            if notifier is not None:
+                if notifier.read(timeout=int(self.poll_interval * 1000)):
+                    # Let the file settle before the scan picks it up
+                    time.sleep(SETTLE_SECONDS)
+            else:
+                time.sleep(self.poll_interval)
+        if notifier is not None:
+            notifier.close()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                _, _, path, signature = heapq.heappop(self._queue)
+                if self._pending.get(path) != signature:
+                    # Superseded by a newer version of the file, or already handled
+                    continue
+            self._process(path, signature)
+
+    def _process(self, path: str, signature: tuple):
+        from resume_parser import get_resume_parser
+
+        candidate_id = candidate_id_from_filename(path)
+        started = time.perf_counter()
+        resume_data = get_resume_parser().parse_resume(path)
+        entry = {
+            'candidate_id': candidate_id,
+            'path': path,
+            'signature': list(signature),
+            'arrived_at': self._arrived_at.get(path),
+            'parsed_at': time.time(),
+            'parse_seconds': round(time.perf_counter() - started, 3),
+            'resume_data': resume_data
+        }
+        if self.check_duplicates and resume_data.get('parsed_successfully'):
+            try:
+                from dedup_index import get_resume_index
+                entry['near_duplicates'] = [{'session_id': key, 'similarity': round(sim, 2)}
+                                            for key, sim, _ in get_resume_index().query(resume_data['text'])]
+            except Exception as e:
+                print(f"Duplicate check failed for {path}: {e}")
+
+        with self._condition:
+            self._pending.pop(path, None)
+            self._signatures[path] = signature
+            current = self._results.get(candidate_id)
+            # A candidate's most recently modified file wins
+            if current is None or current['path'] == path or tuple(current['signature']) <= signature:
+                self._results[candidate_id] = entry
+                try:
+                    tmp_path = self._cache_path(candidate_id) + '.tmp'
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(entry, f)
+                    os.replace(tmp_path, self._cache_path(candidate_id))
+                except OSError as e:
+                    print(f"Could not cache parsed resume for {candidate_id}: {e}")
+            self._condition.notify_all()
+
+    def prioritize(self, candidate_id: str):
+        """Parse this candidate's resume ahead of the backlog, e.g. when their interview starts."""
+        candidate_id = normalize_candidate_id(candidate_id)
+        with self._condition:
+            self._urgent.add(candidate_id)
+            for i, (priority, sequence, path, signature) in enumerate(self._queue):
+                if priority != URGENT and candidate_id_from_filename(path) == candidate_id:
+                    self._queue[i] = (URGENT, sequence, path, signature)
+            heapq.heapify(self._queue)
+
+    def get(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a candidate's parsed resume.
+
+        Args:
+            candidate_id (str): Candidate ID or name
+
+        Returns:
+            Optional[Dict[str, Any]]: 'resume_data' as returned by ResumeParser.parse_resume, the source
+                                      'path' and 'near_duplicates', or None if no resume has been parsed
+        """
+        with self._condition:
+            return self._results.get(normalize_candidate_id(candidate_id))
+
+    def wait_for(self, candidate_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Like get(), but wait up to `timeout` seconds for a resume that is still arriving or being parsed."""
+        candidate_id = normalize_candidate_id(candidate_id)
+        self.prioritize(candidate_id)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while candidate_id not in self._results:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._condition.wait(remaining)
+            return self._results[candidate_id]
+
+    def wait_for_arrival(self, since: float, timeout: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Return the most recent resume that arrived after `since`, waiting up to `timeout` seconds for one.
+
+        Args:
+            since (float): time.time() after which the file must have arrived
+            timeout (float): Seconds to wait if none has arrived and been parsed yet
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry, as returned by get(), or None
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                arrivals = [entry for entry in self._results.values() if (entry.get('arrived_at') or 0) >= since]
+                if arrivals:
+                    return max(arrivals, key=lambda entry: entry['arrived_at'])
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._condition.wait(remaining)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of parsed candidates and files waiting to be parsed."""
+        with self._condition:
+            return {'parsed': len(self._results), 'queued': len(self._pending)}
+
+# Shared inbox, started on first use
+_inbox = None
+_inbox_lock = threading.Lock()
+
+def get_resume_inbox() -> ResumeInbox:
+    """Return the shared resume inbox, starting it on first use."""
+    global _inbox
+    with _inbox_lock:
+        if _inbox is None:
+            _inbox = ResumeInbox().start()
+        return _inbox
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse resumes as they arrive in the resume inbox.")
+    parser.add_argument("--dir", default=INBOX_DIR, help="Directory to watch")
+    parser.add_argument("--once", action="store_true", help="Parse what is there now, then exit")
+    args = parser.parse_args()
+
+    inbox = ResumeInbox(args.dir).start()
+    try:
+        while True:
+            time.sleep(inbox.poll_interval)
+            stats = inbox.stats()
+            if args.once and not stats['queued'] and inbox.scan() == 0:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        inbox.stop()
+    print(f"{inbox.stats()['parsed']} resumes parsed in {args.dir}")
+
+if __name__ == "__main__":
+    main()
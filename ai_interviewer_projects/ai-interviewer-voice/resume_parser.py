@@ -1,9 +1,71 @@
-# Parse resume PDF into keywords
-import PyPDF2
+# Parse resume PDF and DOCX files into keywords
+import multiprocessing
+import queue
 import re
-from typing import Dict, List, Any
+import time
+from typing import Dict, Iterator, List, Any
 import os
 
+# Resume formats that can be parsed
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+# Per-document limits, so one huge or pathological file can't stall the interview
+MAX_RESUME_BYTES = int(os.environ.get('RICK_MAX_RESUME_BYTES', 10 * 1024 * 1024))
+MAX_EXTRACTION_SECONDS = float(os.environ.get('RICK_MAX_EXTRACTION_SECONDS', '20'))
+
+# PDFs with more pages than this are extracted by worker processes, PAGES_PER_TASK pages at a time
+PARALLEL_PAGE_THRESHOLD = 8
+PAGES_PER_TASK = 4
+
+# Paragraphs per notional page for DOCX files without explicit page breaks
+DOCX_PARAGRAPHS_PER_PAGE = 40
+
+def _iter_docx_pages(docx_path: str) -> Iterator[str]:
+    """Yield the text of a DOCX file in notional pages, then its tables."""
+    import docx
+    document = docx.Document(docx_path)
+    lines = []
+    for paragraph in document.paragraphs:
+        page_break = bool(paragraph._p.xpath('.//w:br[@w:type="page"]'))
+        lines.append(paragraph.text)
+        if page_break or len(lines) >= DOCX_PARAGRAPHS_PER_PAGE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+    
+    # Many resumes lay out skills and experience in tables
+    for table in document.tables:
+        cells = [cell.text for row in table.rows for cell in row.cells if cell.text]
+        if cells:
+            yield "\n".join(cells) + "\n"
+
+def _extract_pages(path: str, start: int, stop: int, results) -> None:
+    """
+    Put the text of pages [start, stop) of a resume on a queue. Runs in a worker process.
+    
+    With stop=None, this is the first worker: for a PDF it reports the page count and
+    extracts either the whole document or, if it is long, only its first PAGES_PER_TASK
+    pages while other workers take the rest. A DOCX is always extracted by one worker.
+    """
+    try:
+        if path.lower().endswith('.docx'):
+            for index, text in enumerate(_iter_docx_pages(path)):
+                results.put(('page', index, text))
+        else:
+            import PyPDF2
+            with open(path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                page_count = len(pdf_reader.pages)
+                if stop is None:
+                    results.put(('count', page_count))
+                    stop = page_count if page_count <= PARALLEL_PAGE_THRESHOLD else PAGES_PER_TASK
+                for index in range(start, min(stop, page_count)):
+                    results.put(('page', index, pdf_reader.pages[index].extract_text() or ""))
+        results.put(('done', start))
+    except Exception as e:
+        results.put(('error', f"{type(e).__name__}: {e}"))
+
 class ResumeParser:
     def __init__(self):
         self.skills_keywords = {
@@ -46,6 +108,7 @@ class ResumeParser:
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF file."""
         try:
+            import PyPDF2
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 text = ""
@@ -56,6 +119,100 @@ class ResumeParser:
             print(f"Error reading PDF: {e}")
             return ""
     
+    def iter_page_texts(self, path: str, max_bytes: int = MAX_RESUME_BYTES,
+                        timeout: float = MAX_EXTRACTION_SECONDS) -> Iterator[str]:
+        """
+        Stream the text of a resume page by page, dispatching on the file format.
+        
+        Args:
+            path (str): Path to a PDF or DOCX resume
+            max_bytes (int): Reject files larger than this
+            timeout (float): Stop extracting after this many seconds
+        
+        Yields:
+            str: Text of each page, in order
+        
+        Raises:
+            ValueError: If the file is too large or its format isn't supported
+            TimeoutError: If extraction takes longer than the timeout
+        """
+        size = os.path.getsize(path)
+        if size > max_bytes:
+            raise ValueError(f"Resume is {size} bytes, over the {max_bytes} byte limit")
+        
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported resume format: {extension or 'no extension'}")
+        yield from self._iter_pages_in_workers(path, time.monotonic() + timeout)
+    
+    def _iter_pages_in_workers(self, path: str, deadline: float) -> Iterator[str]:
+        """
+        Extract pages in worker processes that are killed if they overrun the deadline.
+        
+        A single pathological page can hang PyPDF2 indefinitely, so the deadline has to be
+        enforced from outside the extracting process. Workers are spawned rather than forked,
+        since this often runs on a background thread of a multithreaded process.
+        """
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        workers = []
+        
+        def start_worker(start, stop):
+            worker = context.Process(target=_extract_pages, args=(path, start, stop, results), daemon=True)
+            worker.start()
+            workers.append(worker)
+        
+        start_worker(0, None)
+        pages = {}
+        next_page = 0
+        done = 0
+        try:
+            while done < len(workers):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Resume text extraction timed out")
+                try:
+                    message = results.get(timeout=min(remaining, 0.5))
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers):
+                        raise RuntimeError("Resume text extraction worker exited unexpectedly")
+                    continue
+                
+                kind = message[0]
+                if kind == 'count':
+                    # Long document: more workers take the remaining pages in contiguous blocks
+                    page_count = message[1]
+                    if page_count > PARALLEL_PAGE_THRESHOLD:
+                        rest = page_count - PAGES_PER_TASK
+                        extra = min(max((os.cpu_count() or 1) - 1, 1), -(-rest // PAGES_PER_TASK))
+                        block = -(-rest // extra)
+                        for start in range(PAGES_PER_TASK, page_count, block):
+                            start_worker(start, min(start + block, page_count))
+                elif kind == 'page':
+                    pages[message[1]] = message[2]
+                    # Hand pages on in order as soon as they are available
+                    while next_page in pages:
+                        yield pages.pop(next_page)
+                        next_page += 1
+                elif kind == 'done':
+                    done += 1
+                else:
+                    raise RuntimeError(f"Could not extract resume text: {message[1]}")
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join(timeout=1)
+            results.close()
+    
+    def extract_text(self, path: str) -> str:
+        """Extract the full text of a PDF or DOCX resume."""
+        try:
+            return "".join(self.iter_page_texts(path)).lower()
+        except Exception as e:
+            print(f"Error reading resume: {e}")
+            return ""
+    
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract skills from resume text based on role categories."""
         found_skills = {}
@@ -128,15 +285,33 @@ class ResumeParser:
         return max(role_scores, key=role_scores.get)
     
     def parse_resume(self, pdf_path: str) -> Dict[str, Any]:
-        """Main method to parse resume and return structured data."""
+        """Main method to parse a PDF or DOCX resume and return structured data."""
         if not os.path.exists(pdf_path):
             return {"error": "Resume file not found"}
         
-        text = self.extract_text_from_pdf(pdf_path)
-        if not text:
+        # Match skills page by page while the remaining pages are still being extracted
+        pages = []
+        found = {role: set() for role in self.skills_keywords}
+        tail = ""
+        try:
+            for page in self.iter_page_texts(pdf_path):
+                page = page.lower()
+                pages.append(page)
+                # Include the end of the previous page so keywords split across pages still match
+                window = tail + page
+                for role, keywords in self.skills_keywords.items():
+                    found[role].update(k for k in keywords if k not in found[role] and k in window)
+                tail = page[-40:]
+        except Exception as e:
+            print(f"Error reading resume: {e}")
+            return {"error": f"Could not extract text from resume: {e}"}
+        
+        text = "".join(pages)
+        if not text.strip():
             return {"error": "Could not extract text from resume"}
         
-        skills = self.extract_skills(text)
+        # Keep each role's skills in keyword order, as extract_skills() does
+        skills = {role: [k for k in keywords if k in found[role]] for role, keywords in self.skills_keywords.items()}
         experience = self.extract_experience(text)
         suggested_role = self.suggest_role(skills, experience)
         
@@ -148,5 +323,12 @@ class ResumeParser:
             "parsed_successfully": True
         }
 
-# Global instance
-resume_parser = ResumeParser()
\ No newline at end of file
+# Shared instance, created on first use
+_resume_parser = None
+
+def get_resume_parser() -> ResumeParser:
+    """Return the shared ResumeParser, creating it on first use."""
+    global _resume_parser
+    if _resume_parser is None:
+        _resume_parser = ResumeParser()
+    return _resume_parser
@@ -0,0 +1,118 @@
+# On-disk layout for archived interview sessions
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Root directory for all sessions; one sub-directory per session ID
+SESSIONS_DIR = os.environ.get('RICK_SESSIONS_DIR', 'sessions')
+
+# Name of the file holding a session's transcript, feedback and resume data
+SESSION_FILE = 'session.json'
+
+# Audio formats answers may be stored in, in order of preference
+RECORDING_EXTENSIONS = ('.flac', '.wav')
+
+def new_session_id() -> str:
+    """Create a sortable, unique session ID."""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+def session_dir(session_id: str, create: bool = False) -> str:
+    """
+    Get the directory that holds a session's files.
+
+    Args:
+        session_id (str): ID of the session
+        create (bool): Create the directory if it doesn't exist
+
+    Returns:
+        str: Path to the session directory
+    """
+    path = os.path.join(SESSIONS_DIR, session_id)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+def answer_recording_base(session_id: str, question_number: int, follow_up: bool = False) -> str:
+    """
+    Get the path, without extension, where an answer's audio is recorded.
+
+    Args:
+        session_id (str): ID of the session
+        question_number (int): Number of the question that was answered
+        follow_up (bool): Whether the answer was to the question's follow-up
+
+    Returns:
+        str: Recording path without extension; the recorder picks the audio format
+    """
+    name = f"q{question_number:02d}_follow_up" if follow_up else f"q{question_number:02d}"
+    return os.path.join(session_dir(session_id, create=True), name)
+
+def find_answer_recording(session_id: str, question_number: int, follow_up: bool = False) -> Optional[str]:
+    """
+    Look up the recorded audio of an answer.
+
+    Args:
+        session_id (str): ID of the session
+        question_number (int): Number of the question that was answered
+        follow_up (bool): Whether to look up the answer to the follow-up
+
+    Returns:
+        Optional[str]: Path to the recording, or None if the answer wasn't recorded
+    """
+    name = f"q{question_number:02d}_follow_up" if follow_up else f"q{question_number:02d}"
+    for extension in RECORDING_EXTENSIONS:
+        path = os.path.join(session_dir(session_id), name + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+def answer_key(item: Dict[str, Any]) -> str:
+    """Identify an answer within its session, e.g. '3' or '3_follow_up'."""
+    return f"{item.get('question_number')}{'_follow_up' if item.get('follow_up') else ''}"
+
+def save_session(session_id: str, data: Dict[str, Any]) -> str:
+    """
+    Archive a finished session.
+
+    Args:
+        session_id (str): ID of the session
+        data (dict): Session data (role, interview_data, final_evaluation, resume_data, ...)
+
+    Returns:
+        str: Path to the archived session file
+    """
+    path = os.path.join(session_dir(session_id, create=True), SESSION_FILE)
+    # Write to a temporary file first so a crash never leaves a half-written session
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+    return path
+
+def load_session(session_id: str) -> Optional[Dict[str, Any]]:
+    """Load an archived session, or None if it doesn't exist or can't be read."""
+    path = os.path.join(session_dir(session_id), SESSION_FILE)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def iter_session_ids() -> Iterator[str]:
+    """Yield the IDs of all archived sessions, oldest first."""
+    if not os.path.isdir(SESSIONS_DIR):
+        return
+    with os.scandir(SESSIONS_DIR) as entries:
+        names = sorted(entry.name for entry in entries if entry.is_dir() and not entry.name.startswith('_'))
+    for name in names:
+        if os.path.exists(os.path.join(SESSIONS_DIR, name, SESSION_FILE)):
+            yield name
+
+def iter_sessions() -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Lazily yield (session_id, data) for every archived session, loading one at a time."""
+    for session_id in iter_session_ids():
+        data = load_session(session_id)
+        if data is not None:
+            yield session_id, data